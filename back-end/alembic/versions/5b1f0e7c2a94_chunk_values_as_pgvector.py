@@ -0,0 +1,36 @@
+"""Chunk values as pgvector
+
+Revision ID: 5b1f0e7c2a94
+Revises: 9d2ac81c6a0c
+Create Date: 2025-12-10 18:42:11.204517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+import pgvector.sqlalchemy
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1f0e7c2a94'
+down_revision: Union[str, None] = '9d2ac81c6a0c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS vector')
+    op.alter_column('chunk', 'values',
+               existing_type=postgresql.ARRAY(sa.Float()),
+               type_=pgvector.sqlalchemy.Vector(1536),
+               existing_nullable=False,
+               postgresql_using='"values"::real[]::vector(1536)')
+
+
+def downgrade() -> None:
+    op.alter_column('chunk', 'values',
+               existing_type=pgvector.sqlalchemy.Vector(1536),
+               type_=postgresql.ARRAY(sa.Float()),
+               existing_nullable=False,
+               postgresql_using='"values"::real[]::double precision[]')
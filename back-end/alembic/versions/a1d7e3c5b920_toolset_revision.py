@@ -0,0 +1,25 @@
+"""toolset revision
+
+Revision ID: a1d7e3c5b920
+Revises: f4a7c2d9b816
+Create Date: 2025-12-16 09:41:22.507316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1d7e3c5b920'
+down_revision: Union[str, None] = 'f4a7c2d9b816'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('toolset', sa.Column('revision', sa.BigInteger(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('toolset', 'revision')
@@ -0,0 +1,102 @@
+"""kb_stats counters
+
+Revision ID: e8f2b6a0d913
+Revises: c3a9d4e1f7b2
+Create Date: 2025-12-12 15:27:48.631075
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8f2b6a0d913'
+down_revision: Union[str, None] = 'c3a9d4e1f7b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('kb_stats',
+    sa.Column('scope', sa.Text(), nullable=False),
+    sa.Column('value', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('scope', name=op.f('pk_kb_stats'))
+    )
+
+    # Helper used by both triggers to add a delta to a counter, creating it if needed.
+    op.execute("""
+        CREATE FUNCTION kb_stats_add(counter_scope TEXT, delta BIGINT) RETURNS void AS $$
+        BEGIN
+            INSERT INTO kb_stats (scope, value) VALUES (counter_scope, delta)
+            ON CONFLICT (scope) DO UPDATE SET value = kb_stats.value + delta;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    op.execute("""
+        CREATE FUNCTION kb_stats_knowledge_base_trigger() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                IF OLD.is_active THEN
+                    PERFORM kb_stats_add('active_kb_count', -1);
+                END IF;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                IF NEW.is_active THEN
+                    PERFORM kb_stats_add('active_kb_count', 1);
+                END IF;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_kb_stats_knowledge_base
+        AFTER INSERT OR UPDATE OF is_active OR DELETE ON knowledge_base
+        FOR EACH ROW EXECUTE FUNCTION kb_stats_knowledge_base_trigger();
+    """)
+
+    op.execute("""
+        CREATE FUNCTION kb_stats_file_trigger() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                IF OLD.is_active AND OLD.knowledge_base_id IS NOT NULL THEN
+                    PERFORM kb_stats_add('files:' || OLD.knowledge_base_id, -1);
+                END IF;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                IF NEW.is_active AND NEW.knowledge_base_id IS NOT NULL THEN
+                    PERFORM kb_stats_add('files:' || NEW.knowledge_base_id, 1);
+                END IF;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_kb_stats_file
+        AFTER INSERT OR UPDATE OF is_active, knowledge_base_id OR DELETE ON file
+        FOR EACH ROW EXECUTE FUNCTION kb_stats_file_trigger();
+    """)
+
+    # Seed the counters from the existing rows.
+    op.execute("""
+        INSERT INTO kb_stats (scope, value)
+        SELECT 'active_kb_count', count(*) FROM knowledge_base WHERE is_active
+    """)
+    op.execute("""
+        INSERT INTO kb_stats (scope, value)
+        SELECT 'files:' || knowledge_base_id, count(*) FROM file
+        WHERE is_active AND knowledge_base_id IS NOT NULL
+        GROUP BY knowledge_base_id
+    """)
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS trg_kb_stats_file ON file')
+    op.execute('DROP TRIGGER IF EXISTS trg_kb_stats_knowledge_base ON knowledge_base')
+    op.execute('DROP FUNCTION IF EXISTS kb_stats_file_trigger()')
+    op.execute('DROP FUNCTION IF EXISTS kb_stats_knowledge_base_trigger()')
+    op.execute('DROP FUNCTION IF EXISTS kb_stats_add(TEXT, BIGINT)')
+    op.drop_table('kb_stats')
@@ -0,0 +1,30 @@
+"""toolset keyset pagination index
+
+Revision ID: f4a7c2d9b816
+Revises: e8f2b6a0d913
+Create Date: 2025-12-15 10:12:03.218734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a7c2d9b816'
+down_revision: Union[str, None] = 'e8f2b6a0d913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_toolset_active_created_at_id',
+        'toolset',
+        ['is_active', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_toolset_active_created_at_id', table_name='toolset')
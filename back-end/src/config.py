@@ -7,7 +7,16 @@ load_dotenv()
 class Settings(BaseSettings):
     database_url: str = "postgresql+asyncpg://fastapi:fastapi@db:5432/fastapi"
     echo_sql: bool = False
+    db_pool_size: int = 50
+    db_max_overflow: int = 50
+    db_pool_recycle: int = 1800
+    # Connections opened at startup so the first requests do not pay for the handshake.
+    db_pool_warmup: int = 10
+    # Per-connection asyncpg caches of prepared statements.
+    db_statement_cache_size: int = 1000
     qdrant_url: str = "http://qdrant:6333"
+    # "int8" stores chunk embeddings quantized with a per-vector scale, "fp32" keeps exact values.
+    chunk_embedding_precision: str = "int8"
 
 
     OPENAI_API_KEY: str = Field(..., alias="OPENAI_API_KEY")
@@ -1,10 +1,13 @@
 # import logfire
+import asyncio
 import contextlib
 
 from typing import Annotated
 from fastapi import Depends
-from typing import Any, AsyncIterator
-from sqlalchemy import MetaData
+from typing import Any, AsyncIterator, Callable
+from sqlalchemy import MetaData, event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from pgvector.asyncpg import register_vector
 
 from sqlalchemy.ext.asyncio import (
     AsyncConnection,
@@ -25,10 +28,16 @@ Base.metadata = MetaData(naming_convention={
         "pk": "pk_%(table_name)s"
     })
 
+def _register_vector_codec(dbapi_connection, connection_record):
+    # Send pgvector values through asyncpg's binary codec instead of text.
+    dbapi_connection.run_async(register_vector)
+
 class DatabaseSessionManager():
     def __init__(self, host: str, engine_kwargs: dict[str, Any] = {}):
         print("Initializing DatabaseSessionManager", flush=True)
         self._engine = create_async_engine(host, **engine_kwargs)
+        if self._engine.dialect.driver == "asyncpg":
+            event.listen(self._engine.sync_engine, "connect", _register_vector_codec)
         self._sessionmaker = async_sessionmaker(autocommit=False, bind=self._engine)
         print("DatabaseSessionManager initialized", flush=True)
 
@@ -40,6 +49,17 @@ class DatabaseSessionManager():
         self._engine = None
         self._sessionmaker = None
 
+    async def warm_up(self, connections: int):
+        """Open and release `connections` pooled connections at once to fill the pool."""
+        if self._engine is None:
+            raise Exception("DatabaseSessionManager is not initialized")
+
+        async def _checkout():
+            async with self._engine.connect():
+                pass
+
+        await asyncio.gather(*(_checkout() for _ in range(connections)))
+
     # def instrument_sqlalchemy(self):
     #     logfire.instrument_sqlalchemy(self._engine)
 
@@ -71,7 +91,27 @@ class DatabaseSessionManager():
 
 class SessionManagerProvider:
     def __init__(self):
-        self._session_manager = DatabaseSessionManager(settings.database_url, {"echo": settings.echo_sql})
+        self._session_manager = DatabaseSessionManager(
+            settings.database_url,
+            {
+                "echo": settings.echo_sql,
+                # Large enough to hold the compiled form of every statement shape the app issues.
+                "query_cache_size": 4096,
+                "poolclass": AsyncAdaptedQueuePool,
+                "pool_size": settings.db_pool_size,
+                "max_overflow": settings.db_max_overflow,
+                # Connections are recycled before Postgres or a proxy drops them,
+                # so the extra round-trip of pre-ping is not needed.
+                "pool_recycle": settings.db_pool_recycle,
+                "pool_pre_ping": False,
+                # Hand out the most recently used connection first.
+                "pool_use_lifo": True,
+                "connect_args": {
+                    "statement_cache_size": settings.db_statement_cache_size,
+                    "prepared_statement_cache_size": settings.db_statement_cache_size,
+                },
+            },
+        )
     
     def get_session_manager(self):
         return self._session_manager
@@ -86,4 +126,32 @@ async def get_db_session():
     async with session_manager_provider.get_session_manager().session() as session:
         yield session
 
-DBSessionDep = Annotated[AsyncSession, Depends(get_db_session)]
\ No newline at end of file
+DBSessionDep = Annotated[AsyncSession, Depends(get_db_session)]
+
+async def get_db_read_session(session: DBSessionDep):
+    # Begin the transaction read-only on one snapshot, so Postgres can skip
+    # write bookkeeping and a version check and the load that follows it
+    # see the same data.
+    if session.bind.dialect.name == "postgresql":
+        await session.connection(execution_options={
+            "postgresql_readonly": True,
+            "isolation_level": "REPEATABLE READ",
+        })
+    return session
+
+DBReadSessionDep = Annotated[AsyncSession, Depends(get_db_read_session)]
+
+def on_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    """Run callback once the write session's transaction has been committed."""
+    session.info.setdefault("on_commit", []).append(callback)
+
+async def get_db_write_session(session: DBSessionDep):
+    # Commit once the endpoint returns; on an exception the session manager
+    # rolls back instead. Function scope runs this before the response is
+    # sent, so a failed commit still reaches the client as an error.
+    yield session
+    await session.commit()
+    for callback in session.info.pop("on_commit", ()):
+        callback()
+
+DBWriteSessionDep = Annotated[AsyncSession, Depends(get_db_write_session, scope="function")]
\ No newline at end of file
@@ -0,0 +1,55 @@
+from typing import Optional
+
+import httpx
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+
+# Request timeouts (in seconds) for outbound HTTP calls, by caller.
+HTTP_TIMEOUTS = {
+    "webhook": 30.0,
+}
+
+# Methods that are safe to send again after a connection-level failure.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE"})
+
+_webhook_client: Optional[httpx.AsyncClient] = None
+
+
+def get_webhook_client() -> httpx.AsyncClient:
+    """Return the process-wide client used by webhook tools, creating it on first use."""
+    global _webhook_client
+    if _webhook_client is None or _webhook_client.is_closed:
+        _webhook_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            timeout=httpx.Timeout(HTTP_TIMEOUTS["webhook"]),
+        )
+    return _webhook_client
+
+
+async def close_http_clients():
+    global _webhook_client
+    if _webhook_client is not None:
+        await _webhook_client.aclose()
+        _webhook_client = None
+
+
+@retry(
+    retry=retry_if_exception_type(httpx.RequestError),
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=0.1, max=1.0),
+    reraise=True,
+)
+async def _request_with_retries(client: httpx.AsyncClient, method: str, **kwargs) -> httpx.Response:
+    return await client.request(method, **kwargs)
+
+
+async def send_webhook_request(method: str, **kwargs) -> httpx.Response:
+    """
+    Send a request through the shared webhook client.
+
+    Idempotent methods are retried up to three times on transport errors
+    (connection resets, timeouts); other methods are sent once.
+    """
+    client = get_webhook_client()
+    if method.upper() in IDEMPOTENT_METHODS:
+        return await _request_with_retries(client, method, **kwargs)
+    return await client.request(method, **kwargs)
@@ -1,13 +1,30 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from src.config import settings
+from src.database.session_manager import session_manager_provider
+from src.http_clients import close_http_clients, get_webhook_client
 from src.modules.toolsets.routes import toolset_router
 from src.modules.agents.routes import agent_router
 from src.modules.knowledge_base.routes import knowledge_base_router
 from src.modules.chat.routes import chat_router
 from src.modules.copilot.routes import models_router
 
-app = FastAPI(title="PUC-Rio Final Project API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    get_webhook_client()
+    session_manager = session_manager_provider.get_session_manager()
+    await session_manager.warm_up(settings.db_pool_warmup)
+    yield
+    await close_http_clients()
+    # Close the pooled connections instead of leaving them for the server to time out.
+    await session_manager.close()
+
+
+app = FastAPI(title="PUC-Rio Final Project API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -1,3 +1,5 @@
+from itertools import groupby
+from operator import itemgetter
 from typing import Dict, List, Optional
 from uuid import UUID
 
@@ -379,10 +381,12 @@ class AgentRepository:
                 AgentToolsetAssociation.agent_id.in_(agent_ids),
                 Toolset.is_active == True,
             )
+            .order_by(AgentToolsetAssociation.agent_id)
         )
         result = await session.execute(stmt)
-        rows = result.all()
-        toolset_map: Dict[UUID, List[Toolset]] = {}
-        for agent_id, toolset in rows:
-            toolset_map.setdefault(agent_id, []).append(toolset)
-        return toolset_map
\ No newline at end of file
+        # Rows arrive grouped by agent, so groupby builds the map without a
+        # per-row setdefault.
+        return {
+            agent_id: [toolset for _, toolset in rows]
+            for agent_id, rows in groupby(result.all(), key=itemgetter(0))
+        }
\ No newline at end of file
@@ -2,12 +2,13 @@ from uuid import UUID
 
 from fastapi import APIRouter, Query, Response, status
 
-from src.database.session_manager import DBSessionDep
+from src.database.session_manager import DBSessionDep, DBWriteSessionDep, on_commit
 from src.modules.agents.repositories.AgentRepository import (
     AgentRepository,
     create_agent_repository,
     get_agent_repository,
 )
+from src.modules.toolsets.ToolFactory import invalidate_agent
 from .routes_schemas import (
     AgentListResponse,
     AgentResponse,
@@ -75,7 +76,7 @@ async def get_agent(agent_id: UUID, session: DBSessionDep):
     "/agents/{agent_id}",
     response_model=AgentResponse,
 )
-async def update_agent(agent_id: UUID, payload: UpdateAgent, session: DBSessionDep):
+async def update_agent(agent_id: UUID, payload: UpdateAgent, session: DBWriteSessionDep):
     """Update agent configuration and linked resources."""
     repo = await get_agent_repository(session, agent_id)
     await repo.update(
@@ -91,7 +92,8 @@ async def update_agent(agent_id: UUID, payload: UpdateAgent, session: DBSessionD
         knowledge_base_ids=payload.knowledge_base_ids,
         toolset_ids=payload.toolset_ids,
     )
-    await session.commit()
+    # Cached managers would keep the old toolsets and knowledge bases.
+    on_commit(session, lambda: invalidate_agent(agent_id))
     return AgentResponse(**repo.get_agent().model_dump())
 
 
@@ -99,10 +101,10 @@ async def update_agent(agent_id: UUID, payload: UpdateAgent, session: DBSessionD
     "/agents/{agent_id}",
     status_code=status.HTTP_204_NO_CONTENT,
 )
-async def delete_agent(agent_id: UUID, session: DBSessionDep):
+async def delete_agent(agent_id: UUID, session: DBWriteSessionDep):
     """Delete an agent and remove its associations."""
     repo = await get_agent_repository(session, agent_id)
     await repo.delete()
-    await session.commit()
+    on_commit(session, lambda: invalidate_agent(agent_id))
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
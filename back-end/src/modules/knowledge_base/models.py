@@ -1,13 +1,16 @@
 import uuid
 
-from sqlalchemy import Integer, String, ForeignKey, Boolean,  DateTime, func, Index, Text, JSON, Float, SmallInteger, null
+from sqlalchemy import Integer, String, ForeignKey, Boolean,  DateTime, func, Index, Text, JSON, Float, SmallInteger, null, LargeBinary, REAL, BigInteger
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship, mapped_column
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.dialects.postgresql import JSONB
+from pgvector.sqlalchemy import Vector
 
 from src.database.session_manager import Base
- 
+
+# Dimension of the text-embedding-3-small vectors stored for each chunk.
+EMBEDDING_DIMENSIONS = 1536
 
 class KnowledgeBase(Base):
     __tablename__ = 'knowledge_base'
@@ -53,7 +56,10 @@ class Chunk(Base):
     content = mapped_column(Text, nullable=False)
     page = mapped_column(Integer, nullable=False)
     seq_num = mapped_column(Integer, nullable=False)
-    values = mapped_column(ARRAY(Float), nullable=False)
+    values = mapped_column(Vector(EMBEDDING_DIMENSIONS), nullable=True)
+    # int8 quantized embedding, dequantized as values_i8 * values_scale
+    values_i8 = mapped_column(LargeBinary, nullable=True)
+    values_scale = mapped_column(REAL, nullable=True)
     num_tokens = mapped_column(Integer, nullable=True, default=0)
     created_at = mapped_column(DateTime, nullable=False, default=func.now())
     updated_at = mapped_column(
@@ -64,3 +70,15 @@ class Chunk(Base):
 
     def __str__(self):
         return self.content
+
+
+class KnowledgeBaseStats(Base):
+    """
+    Counters kept up to date by database triggers (see the kb_stats migration).
+
+    Scopes: 'active_kb_count' and 'files:<knowledge_base_id>'.
+    """
+    __tablename__ = 'kb_stats'
+
+    scope = mapped_column(Text, primary_key=True)
+    value = mapped_column(BigInteger, nullable=False, default=0)
@@ -1,8 +1,11 @@
+import asyncio
 import os
+import shutil
 import tempfile
 import uuid
 from typing import List, Dict, Any
 
+import numpy as np
 from fastapi import UploadFile
 from pydantic import BaseModel
 
@@ -14,10 +17,12 @@ from pyzerox import zerox
 
 from src.database.session_manager import session_manager_provider
 from src.config import settings
-from src.modules.knowledge_base.models import Chunk
+from src.modules.knowledge_base.models import EMBEDDING_DIMENSIONS, Chunk
 from src.modules.knowledge_base.repositories.KnowledgeBaseRepository import FileRepository, KnowledgeBaseRepository, get_file_repository, get_knowledge_base_repository
 from src.modules.knowledge_base.repositories.ChunkRepository import create_chunk_repository
 
+UPLOAD_COPY_CHUNK_SIZE = 1024 * 1024
+
 
 class FileContent(BaseModel):
     class FilePage(BaseModel):
@@ -40,31 +45,20 @@ class ProcessFile:
         self.openai_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
         self.qdrant_client = AsyncQdrantClient(url=settings.qdrant_url)
 
-    async def get_file_content(self, file: UploadFile) -> FileContent:
-        # Create temp file
-        suffix = os.path.splitext(file.filename)[1] if file.filename else ""
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            content = await file.read()
-            tmp.write(content)
-            tmp_path = tmp.name
+    async def get_file_content(self, file_path: str) -> FileContent:
+        # Ensure OPENAI_API_KEY is set for zerox
+        os.environ["OPENAI_API_KEY"] = settings.OPENAI_API_KEY
 
-        try:
-            # Ensure OPENAI_API_KEY is set for zerox
-            os.environ["OPENAI_API_KEY"] = settings.OPENAI_API_KEY
-            
-            # Use py-zerox to get markdown
-            # Using gpt-4o-mini as requested
-            result = await zerox(file_path=tmp_path, model="gpt-4o-mini")
-            
-            pages = []
-            # result.pages is expected to be a list of page objects with content
-            for i, page in enumerate(result.pages):
-                pages.append(FileContent.FilePage(page=i+1, content=page.content))
-            
-            return FileContent(pages=pages)
-        finally:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
+        # Use py-zerox to get markdown
+        # Using gpt-4o-mini as requested
+        result = await zerox(file_path=file_path, model="gpt-4o-mini")
+
+        pages = []
+        # result.pages is expected to be a list of page objects with content
+        for i, page in enumerate(result.pages):
+            pages.append(FileContent.FilePage(page=i+1, content=page.content))
+
+        return FileContent(pages=pages)
 
     async def chunk_file_content(self, file_content: FileContent) -> ChunkedFileContent:
         text_splitter = RecursiveCharacterTextSplitter(
@@ -100,7 +94,7 @@ class ProcessFile:
         if kb_id not in collection_names:
             await self.qdrant_client.create_collection(
                 collection_name=kb_id,
-                vectors_config=qdrant_models.VectorParams(size=1536, distance=qdrant_models.Distance.COSINE),
+                vectors_config=qdrant_models.VectorParams(size=EMBEDDING_DIMENSIONS, distance=qdrant_models.Distance.COSINE),
             )
 
         points = []
@@ -133,7 +127,7 @@ class ProcessFile:
                 content=chunk.content,
                 page=chunk.page,
                 seq_num=chunk.seq_num,
-                values=embedding,
+                values=np.asarray(embedding, dtype=np.float32),
                 num_tokens=0, 
                 file_id=file_id
             ))
@@ -150,8 +144,8 @@ class ProcessFile:
             chunk_repo = await create_chunk_repository(self.file_repo.session)
             await chunk_repo.bulk_create(chunks=db_chunks)
 
-    async def process_file(self, file: UploadFile) -> Dict[str, Any]:
-        file_content = await self.get_file_content(file)
+    async def process_file(self, file_path: str) -> Dict[str, Any]:
+        file_content = await self.get_file_content(file_path)
         chunked_file_content = await self.chunk_file_content(file_content)
         await self.embed_and_save_file_chunks(chunked_file_content)
         
@@ -162,15 +156,50 @@ class ProcessFile:
         }
 
 
-async def process_file_bg_task(kb_id: uuid.UUID, file_id: uuid.UUID, file: UploadFile):
+def _copy_upload_to_disk(file: UploadFile) -> str:
+    suffix = os.path.splitext(file.filename)[1] if file.filename else ""
+    file.file.seek(0)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+        shutil.copyfileobj(file.file, tmp, UPLOAD_COPY_CHUNK_SIZE)
+        return tmp.name
+
+
+async def spool_upload_file(file: UploadFile) -> str:
+    """
+    Stream an uploaded file to a temporary path owned by the background task.
+
+    The request's UploadFile is closed once the response is sent, so the worker
+    gets a path instead. The copy runs in a thread in fixed-size chunks, keeping
+    memory flat regardless of file size. process_file_bg_task removes the file.
+    """
+    return await asyncio.to_thread(_copy_upload_to_disk, file)
+
+
+def discard_spooled_files(file_paths: List[str]) -> None:
+    """Remove spooled uploads whose background task will never be scheduled."""
+    for file_path in file_paths:
+        try:
+            os.unlink(file_path)
+        except FileNotFoundError:
+            pass
+
+
+async def process_file_bg_task(kb_id: uuid.UUID, file_id: uuid.UUID, file_path: str):
+    try:
+        await _process_file(kb_id, file_id, file_path)
+    finally:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+
+async def _process_file(kb_id: uuid.UUID, file_id: uuid.UUID, file_path: str):
     async with session_manager_provider.get_session_manager().session() as session:
         kb_repo = await get_knowledge_base_repository(session, kb_id)
         file_repo = await get_file_repository(session, file_id)
-        processor = ProcessFile(kb_repo, file_repo)
         try:
             # Process the file
             processor = ProcessFile(kb_repo, file_repo)
-            processing_result = await processor.process_file(file)
+            processing_result = await processor.process_file(file_path)
 
             # Update file with processing results and set to 'active'
             await file_repo.update(
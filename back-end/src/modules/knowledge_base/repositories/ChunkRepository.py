@@ -1,7 +1,9 @@
-from typing import List
+from typing import List, Optional, Tuple
 
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config import settings
 from src.modules.knowledge_base.models import Chunk
 from src.modules.knowledge_base.schemas import ChunkSchema
 
@@ -22,33 +24,75 @@ class ChunkRepository:
         self._chunks: List[Chunk] = []
         self._chunk_schemas: List[ChunkSchema] = []
 
-    async def bulk_create(self, *, chunks: List[Chunk]) -> "ChunkRepository":
+    async def bulk_create(
+        self, *, chunks: List[Chunk], precision: Optional[str] = None
+    ) -> "ChunkRepository":
         """Persist a list of Chunk models in one batch."""
         if not chunks:
             return self
 
+        # Work on the whole batch as one (n, dim) matrix instead of row by row.
+        values = np.stack([np.asarray(chunk.values, dtype=np.float32) for chunk in chunks])
+        if (precision or settings.chunk_embedding_precision) == "int8":
+            quantized, scales = self.quantize_values(values)
+            for chunk, row, scale in zip(chunks, quantized, scales):
+                chunk.values_i8 = row.tobytes()
+                chunk.values_scale = float(scale)
+                chunk.values = None
+            values = quantized.astype(np.float32) * scales[:, None]
+
         self.session.add_all(chunks)
         await self.session.flush()
         # Refreshing only if needed later; here we keep objects as-is for performance.
         self._chunks = chunks
-        self._chunk_schemas = [self.chunk_model_to_schema(chunk) for chunk in chunks]
+        # Rows were just written from trusted data, so skip pydantic validation.
+        self._chunk_schemas = [
+            ChunkSchema.model_construct(
+                id=chunk.id,
+                content=chunk.content,
+                page=chunk.page,
+                seq_num=chunk.seq_num,
+                values=row,
+                num_tokens=chunk.num_tokens,
+                created_at=chunk.created_at,
+                updated_at=chunk.updated_at,
+                file_id=chunk.file_id,
+                file=None,
+            )
+            for chunk, row in zip(chunks, values)
+        ]
         return self
 
     def get_chunks(self) -> List[ChunkSchema]:
         return self._chunk_schemas
 
+    @staticmethod
+    def quantize_values(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Quantize a (n, dim) float matrix to int8 rows with one scale per row."""
+        scales = np.abs(values).max(axis=1) / 127
+        scales[scales == 0] = 1.0
+        quantized = np.round(values / scales[:, None]).astype(np.int8)
+        return quantized, scales.astype(np.float32)
+
+    @staticmethod
+    def dequantize_values(values_i8: bytes, scale: float) -> np.ndarray:
+        return np.frombuffer(values_i8, dtype=np.int8).astype(np.float32) * np.float32(scale)
+
     @staticmethod
     def chunk_model_to_schema(chunk: Chunk) -> ChunkSchema:
+        if chunk.values is not None:
+            values = np.asarray(chunk.values, dtype=np.float32)
+        else:
+            values = ChunkRepository.dequantize_values(chunk.values_i8, chunk.values_scale)
         return ChunkSchema(
             id=chunk.id,
             content=chunk.content,
             page=chunk.page,
             seq_num=chunk.seq_num,
-            values=chunk.values,
+            values=values,
             num_tokens=chunk.num_tokens,
             created_at=chunk.created_at,
             updated_at=chunk.updated_at,
             file_id=chunk.file_id,
             file=None,
         )
-
@@ -1,13 +1,48 @@
 from typing import Dict, List, Optional
 from uuid import UUID
 
+from cachetools import LRUCache
 from fastapi import HTTPException, status
-from sqlalchemy import func, select
+from sqlalchemy import bindparam, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.modules.knowledge_base.models import File, KnowledgeBase
+from src.modules.knowledge_base.models import File, KnowledgeBase, KnowledgeBaseStats
 from src.modules.knowledge_base.schemas import FileSchema, KnowledgeBaseSchema
 
+# Rows fetched per round-trip when streaming paginated listings.
+STREAM_BATCH_SIZE = 64
+
+# Per-process cache of built knowledge base schemas, keyed by knowledge base id.
+# Each entry carries the version it was built from so stale entries are rebuilt.
+_knowledge_base_schema_cache: LRUCache = LRUCache(maxsize=1024)
+
+
+ACTIVE_KNOWLEDGE_BASES_SCOPE = "active_kb_count"
+
+
+def _files_count_scope(knowledge_base_id: UUID) -> str:
+    return f"files:{knowledge_base_id}"
+
+
+async def _read_stats_counter(session: AsyncSession, scope: str) -> Optional[int]:
+    """Read a trigger-maintained counter, or None when it has not been populated."""
+    stmt = select(KnowledgeBaseStats.value).where(KnowledgeBaseStats.scope == scope)
+    result = await session.execute(stmt)
+    return result.scalar_one_or_none()
+
+
+# Built once at import so the hottest lookup reuses a single cached compiled form.
+_active_files_by_knowledge_base_stmt = select(File).where(
+    File.knowledge_base_id.in_(bindparam("knowledge_base_ids", expanding=True)),
+    File.is_active == True,
+)
+
+
+def invalidate_knowledge_base_schema(knowledge_base_id: Optional[UUID]) -> None:
+    """Drop the cached schema of a knowledge base after it or its files change."""
+    if knowledge_base_id is not None:
+        _knowledge_base_schema_cache.pop(knowledge_base_id, None)
+
 
 async def get_knowledge_base_repository(
     session: AsyncSession, knowledge_base_id: UUID
@@ -108,11 +143,17 @@ class KnowledgeBaseRepository:
 
     Handles lifecycle operations for knowledge bases and their associated files.
     """
+    __slots__ = ("session", "knowledge_base", "_files")
+
     def __init__(self, session: AsyncSession):
         self.session = session
         self.knowledge_base: Optional[KnowledgeBase] = None
         self._files: List[File] = []
 
+    @property
+    def knowledge_base_schema(self) -> KnowledgeBaseSchema:
+        return self._get_cached_knowledge_base_schema(self.knowledge_base, self._files)
+
     async def load(self, knowledge_base_id: UUID):
         stmt = select(KnowledgeBase).where(
             KnowledgeBase.id == knowledge_base_id,
@@ -124,7 +165,6 @@ class KnowledgeBaseRepository:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Knowledge base not found")
         self.knowledge_base = knowledge_base
         await self._refresh_files()
-        self.knowledge_base_schema = self._create_knowledge_base_schema(self.knowledge_base, self._files)
         return self
 
     async def create(self, *, name: str, description: Optional[str]):
@@ -132,7 +172,6 @@ class KnowledgeBaseRepository:
         self.session.add(self.knowledge_base)
         await self.session.flush()
         await self.session.refresh(self.knowledge_base)
-        self.knowledge_base_schema = self._create_knowledge_base_schema(self.knowledge_base, [])
         self._files = []
         return self
 
@@ -147,7 +186,7 @@ class KnowledgeBaseRepository:
 
         await self.session.flush()
         await self.session.refresh(self.knowledge_base)
-        self.knowledge_base_schema = self._create_knowledge_base_schema(self.knowledge_base, self._files)
+        invalidate_knowledge_base_schema(self.knowledge_base.id)
         return self
 
     async def delete(self):
@@ -156,7 +195,7 @@ class KnowledgeBaseRepository:
         self.knowledge_base.is_active = False
         await self.session.flush()
         await self.session.refresh(self.knowledge_base)
-        self.knowledge_base_schema = self._create_knowledge_base_schema(self.knowledge_base, self._files)
+        invalidate_knowledge_base_schema(self.knowledge_base.id)
         return self
 
     def get_knowledge_base(self) -> KnowledgeBaseSchema:
@@ -173,9 +212,10 @@ class KnowledgeBaseRepository:
             .offset(offset)
             .limit(page_size)
             .order_by(KnowledgeBase.created_at.desc())
+            .execution_options(yield_per=STREAM_BATCH_SIZE)
         )
-        result = await session.execute(stmt)
-        knowledge_bases = result.scalars().all()
+        result = await session.stream_scalars(stmt)
+        knowledge_bases = [kb async for kb in result]
         kb_ids = [kb.id for kb in knowledge_bases]
         file_map = await KnowledgeBaseRepository._fetch_files_map(session, kb_ids)
         return [
@@ -187,6 +227,9 @@ class KnowledgeBaseRepository:
 
     @staticmethod
     async def count_knowledge_bases(session: AsyncSession) -> int:
+        counter = await _read_stats_counter(session, ACTIVE_KNOWLEDGE_BASES_SCOPE)
+        if counter is not None:
+            return counter
         stmt = select(func.count(KnowledgeBase.id)).where(KnowledgeBase.is_active == True)
         result = await session.execute(stmt)
         return result.scalar_one()
@@ -197,6 +240,23 @@ class KnowledgeBaseRepository:
         file_map = await self._fetch_files_map(self.session, [self.knowledge_base.id])
         self._files = file_map.get(self.knowledge_base.id, [])
 
+    @staticmethod
+    def _get_cached_knowledge_base_schema(
+        knowledge_base: KnowledgeBase,
+        files: List[File],
+    ) -> KnowledgeBaseSchema:
+        version = (
+            knowledge_base.updated_at,
+            max((file.updated_at for file in files), default=None),
+            len(files),
+        )
+        cached = _knowledge_base_schema_cache.get(knowledge_base.id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        schema = KnowledgeBaseRepository._create_knowledge_base_schema(knowledge_base, files)
+        _knowledge_base_schema_cache[knowledge_base.id] = (version, schema)
+        return schema
+
     @staticmethod
     def _create_knowledge_base_schema(
         knowledge_base: KnowledgeBase,
@@ -236,14 +296,10 @@ class KnowledgeBaseRepository:
     ) -> Dict[UUID, List[File]]:
         if not knowledge_base_ids:
             return {}
-        stmt = (
-            select(File)
-            .where(
-                File.knowledge_base_id.in_(knowledge_base_ids),
-                File.is_active == True,
-            )
+        result = await session.execute(
+            _active_files_by_knowledge_base_stmt,
+            {"knowledge_base_ids": knowledge_base_ids},
         )
-        result = await session.execute(stmt)
         files = result.scalars().all()
         file_map: Dict[UUID, List[File]] = {}
         for file in files:
@@ -257,6 +313,8 @@ class FileRepository:
 
     Handles CRUD operations for files.
     """
+    __slots__ = ("session", "file", "file_schema")
+
     def __init__(self, session: AsyncSession):
         self.session = session
         self.file: Optional[File] = None
@@ -292,6 +350,7 @@ class FileRepository:
         self.session.add(file)
         await self.session.flush()
         await self.session.refresh(file)
+        invalidate_knowledge_base_schema(knowledge_base_id)
         self.file = file
         self.file_schema = self.file_model_to_schema(self.file)
         return self
@@ -321,6 +380,7 @@ class FileRepository:
 
         await self.session.flush()
         await self.session.refresh(self.file)
+        invalidate_knowledge_base_schema(self.file.knowledge_base_id)
         self.file_schema = self.file_model_to_schema(self.file)
         return self
 
@@ -330,6 +390,7 @@ class FileRepository:
         self.file.is_active = False
         await self.session.flush()
         await self.session.refresh(self.file)
+        invalidate_knowledge_base_schema(self.file.knowledge_base_id)
         self.file_schema = self.file_model_to_schema(self.file)
         return self
 
@@ -350,9 +411,9 @@ class FileRepository:
             .offset(offset)
             .limit(page_size)
             .order_by(File.created_at.desc())
+            .execution_options(yield_per=STREAM_BATCH_SIZE)
         )
-        result = await session.execute(stmt)
-        files = result.scalars().all()
+        result = await session.stream_scalars(stmt)
         return [
             FileSchema(
                 id=file.id,
@@ -368,13 +429,16 @@ class FileRepository:
                 knowledge_base=None,
                 chunks=[],
             )
-            for file in files
+            async for file in result
         ]
 
     @staticmethod
     async def count_files_for_knowledge_base(
         session: AsyncSession, knowledge_base_id: UUID
     ) -> int:
+        counter = await _read_stats_counter(session, _files_count_scope(knowledge_base_id))
+        if counter is not None:
+            return counter
         stmt = select(func.count(File.id)).where(
             File.knowledge_base_id == knowledge_base_id,
             File.is_active == True,
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
 from fastapi import (
@@ -21,7 +21,12 @@ from .repositories.KnowledgeBaseRepository import (
     get_file_repository,
     get_knowledge_base_repository,
 )
-from .process_file.ProcessFile import ProcessFile, process_file_bg_task
+from .process_file.ProcessFile import (
+    ProcessFile,
+    discard_spooled_files,
+    process_file_bg_task,
+    spool_upload_file,
+)
 from .routes_schemas import (
     FileListResponse,
     FileResponse,
@@ -137,13 +142,70 @@ async def upload_file_to_knowledge_base(
         enum_status="processing",
         enum_type=enum_type or (file.content_type or None)
     )
-    
-    background_tasks.add_task(process_file_bg_task, knowledge_base_id, repo.get_file().id, file)
 
-    await session.commit()
+    # process_file_bg_task holds its own pooled connection for the whole (long)
+    # processing run; size db_pool_size/db_max_overflow with that in mind so
+    # ingestion bursts do not starve request handlers.
+    file_path = await spool_upload_file(file)
+    try:
+        await session.commit()
+    except Exception:
+        # The task that would have removed the spooled copy is never scheduled.
+        discard_spooled_files([file_path])
+        raise
+    background_tasks.add_task(process_file_bg_task, knowledge_base_id, repo.get_file().id, file_path)
     return FileResponse(**repo.get_file().model_dump())
 
 
+@knowledge_base_router.post(
+    "/knowledge-bases/{knowledge_base_id}/files:bulk",
+    status_code=status.HTTP_201_CREATED,
+    response_model=FileListResponse,
+)
+async def bulk_upload_files_to_knowledge_base(
+    background_tasks: BackgroundTasks,
+    knowledge_base_id: UUID,
+    files: List[UploadFile] = File(...),
+    enum_type: Optional[str] = Form(None),
+    session: DBSessionDep = None,
+):
+    """
+    Upload several files to a knowledge base in a single transaction.
+
+    File records are created in request order and committed once. If any of them
+    fails the whole batch is rolled back and no processing is scheduled.
+    """
+    kb_repo = await get_knowledge_base_repository(session, knowledge_base_id)
+
+    file_repos = []
+    for file in files:
+        repo = await create_file_repository(
+            session=session,
+            knowledge_base_id=knowledge_base_id,
+            name=file.filename,
+            enum_status="processing",
+            enum_type=enum_type or (file.content_type or None)
+        )
+        file_repos.append(repo)
+
+    file_paths: List[str] = []
+    try:
+        for file in files:
+            file_paths.append(await spool_upload_file(file))
+        await session.commit()
+    except Exception:
+        # None of the tasks that would remove these copies get scheduled.
+        discard_spooled_files(file_paths)
+        raise
+
+    for file_path, repo in zip(file_paths, file_repos):
+        background_tasks.add_task(process_file_bg_task, knowledge_base_id, repo.get_file().id, file_path)
+    return FileListResponse(
+        total_files=len(file_repos),
+        files=[FileResponse(**repo.get_file().model_dump()) for repo in file_repos],
+    )
+
+
 @knowledge_base_router.get(
     "/knowledge-bases/{knowledge_base_id}/files",
     response_model=FileListResponse,
@@ -1,20 +1,30 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Annotated, List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field
+import numpy as np
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, PlainSerializer
+
+
+# Embeddings are kept as float32 arrays in-process and only turned into plain
+# lists when a response is serialized.
+EmbeddingVector = Annotated[
+    np.ndarray,
+    BeforeValidator(lambda value: np.asarray(value, dtype=np.float32)),
+    PlainSerializer(lambda value: value.tolist(), return_type=List[float]),
+]
 
 
 class ChunkSchema(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, arbitrary_types_allowed=True)
 
     id: UUID
     content: str
     page: int
     seq_num: int
-    values: List[float]
+    values: EmbeddingVector
     num_tokens: Optional[int] = 0
     created_at: datetime
     updated_at: datetime
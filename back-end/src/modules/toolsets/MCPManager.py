@@ -1,4 +1,5 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
+import asyncio
 import json
 
 from fastapi import HTTPException
@@ -6,7 +7,8 @@ from pydantic_ai.mcp import MCPServer, MCPServerStreamableHTTP, MCPServerSSE
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.modules.toolsets.enums.enums import ToolTypeEnum
-from src.modules.toolsets.repositories.ToolRepository import create_tool_repository
+from src.modules.toolsets.models import Tool
+from src.modules.toolsets.repositories.ToolRepository import ToolRepository
 from src.modules.toolsets.repositories.ToolsetRepository import ToolsetRepository
 
 
@@ -21,41 +23,63 @@ class MCPManager:
         self.mcp_server_url = mcp_server_url
         self.mcp_server_auth_header = mcp_server_auth_header
 
-    async def setup_mcp(self, session: AsyncSession):
-        headers: Optional[Dict[str, str]] = None
-        if self.mcp_server_auth_header:
-            if isinstance(self.mcp_server_auth_header, dict):
-                headers = self.mcp_server_auth_header
-            elif isinstance(self.mcp_server_auth_header, str):
+        self.headers: Optional[Dict[str, str]] = None
+        if mcp_server_auth_header:
+            if isinstance(mcp_server_auth_header, dict):
+                self.headers = mcp_server_auth_header
+            elif isinstance(mcp_server_auth_header, str):
                 try:
-                    headers = json.loads(self.mcp_server_auth_header)
+                    self.headers = json.loads(mcp_server_auth_header)
                 except json.JSONDecodeError:
-                    headers = None
+                    self.headers = None
 
+    async def setup_mcp(self, session: AsyncSession) -> List[Tool]:
         mcp_tools = None
+        connected = False
         last_exception: Optional[Exception] = None
 
-        for server_type in [MCPServerStreamableHTTP, MCPServerSSE]:
-            server: MCPServer = server_type(url=self.mcp_server_url)
-            try:
-                mcp_tools = await server.list_tools()
-                break
-            except Exception as exc:
-                last_exception = exc
-        else:
+        # Probe both transports at once and keep whichever answers first, so a
+        # failing streamable HTTP probe no longer delays the SSE attempt.
+        pending = {
+            asyncio.create_task(self._list_tools(server_type))
+            for server_type in [MCPServerStreamableHTTP, MCPServerSSE]
+        }
+        try:
+            while pending and not connected:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        mcp_tools = task.result()
+                        connected = True
+                        break
+                    last_exception = task.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        if not connected:
             raise HTTPException(status_code=400, detail=f"Error connecting to MCP server: {last_exception}")
 
         if not self.toolset_repo.toolset:
             raise HTTPException(status_code=400, detail="Toolset repository is not initialized.")
 
-        for tool in mcp_tools or []:
-            await create_tool_repository(
-                session=session,
-                name=tool.name,
-                description=tool.description,
-                tool_type=ToolTypeEnum.MCP,
-                mcp_title=tool.title,
-                input_schema=tool.inputSchema,
-                output_schema=tool.outputSchema,
-                toolset_id=self.toolset_repo.toolset.id,
-            )
\ No newline at end of file
+        return await ToolRepository.bulk_create(
+            session,
+            [
+                {
+                    "name": tool.name,
+                    "description": tool.description,
+                    "enum_tool_type": ToolTypeEnum.MCP.name,
+                    "mcp_title": tool.title,
+                    "input_schema": tool.inputSchema,
+                    "output_schema": tool.outputSchema,
+                    "toolset_id": self.toolset_repo.toolset.id,
+                }
+                for tool in mcp_tools or []
+            ],
+        )
+
+    async def _list_tools(self, server_type):
+        server: MCPServer = server_type(url=self.mcp_server_url, headers=self.headers)
+        return await server.list_tools()
@@ -1,22 +1,82 @@
+import asyncio
 import datetime
-import json
-from typing import Any, Dict, List, Optional, Type, Union
+import logging
+import string
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Type, Union
 import unicodedata
 from uuid import UUID
 from urllib.parse import quote
 
 import httpx
+import orjson
+from cachetools import LRUCache, TTLCache
 from pydantic_ai import RunContext
 from pydantic_ai.mcp import CallToolFunc, MCPServerSSE, MCPServerStreamableHTTP, ToolResult
 from pydantic_ai.toolsets import FunctionToolset
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.modules.chat.AgentExecutor import BasicDependencies
 from src.database.session_manager import session_manager_provider
+from src.http_clients import HTTP_TIMEOUTS, send_webhook_request
+from src.modules.agents.models import Agent
 from src.modules.agents.repositories.AgentRepository import get_agent_repository
 from src.modules.toolsets.enums.enums import ToolTypeEnum, ToolsetTypeEnum
+from src.modules.toolsets.repositories.ToolRepository import remove_nulls
 from src.modules.toolsets.schemas import ToolSchema, ToolsetSchema
 from pydantic_ai.tools import Tool as PydanticTool
 
+logger = logging.getLogger(__name__)
+
+# Built pydantic-ai tools and CUSTOM toolsets, keyed by the row id and its
+# updated_at so that edits produce a new key instead of serving a stale build.
+# MCP server toolsets are stateful and are never cached.
+_tool_cache: LRUCache = LRUCache(maxsize=1024)
+_toolset_cache: LRUCache = LRUCache(maxsize=256)
+# Tools are built in worker threads (see get_pydantic_toolset) and LRUCache is
+# not thread-safe.
+_tool_cache_lock = threading.Lock()
+# Agent managers used by agent tools, keyed by (agent_id, agent.updated_at).
+# Edits to the agent's toolsets do not bump updated_at, hence the short TTL.
+_agent_manager_cache: TTLCache = TTLCache(maxsize=256, ttl=60)
+
+
+def invalidate_toolset(toolset_id: UUID, tool_ids: Iterable[UUID] = ()) -> None:
+    """
+    Drop the cached builds of a toolset and of the given tools after a write.
+
+    Any agent may use the toolset, so every cached agent manager is dropped too.
+    """
+    tool_ids = set(tool_ids)
+    for key in [key for key in list(_toolset_cache.keys()) if key[0] == toolset_id]:
+        tool_ids.update(tool_id for tool_id, _ in key[2])
+        _toolset_cache.pop(key, None)
+    with _tool_cache_lock:
+        for key in [key for key in list(_tool_cache.keys()) if key[0] in tool_ids]:
+            _tool_cache.pop(key, None)
+    _agent_manager_cache.clear()
+
+
+def invalidate_agent(agent_id: UUID) -> None:
+    """
+    Drop the cached managers of an agent after a write.
+
+    Re-assigning its toolsets or knowledge bases does not bump updated_at, so
+    the key alone would keep serving the old set.
+    """
+    for key in [key for key in list(_agent_manager_cache.keys()) if key[0] == agent_id]:
+        _agent_manager_cache.pop(key, None)
+
+
+def _to_ascii_slug(text: str) -> str:
+    """Turn a display name into an ASCII tool name ("Previsão do tempo" -> "previsao_do_tempo")."""
+    slug = text.lower().replace(' ', '_')
+    if slug.isascii():
+        return slug
+    # Normalize to NFKD form, which separates accents from letters
+    normalized = unicodedata.normalize("NFKD", slug)
+    # Encode to ASCII, ignoring characters that can't be converted, then decode back to str
+    return normalized.encode("ascii", "ignore").decode("ascii")
 
 
 def create_tool_definition(tool: ToolSchema, input_schema: Dict, output_schema: Optional[Dict] = None) -> Dict:
@@ -34,23 +94,17 @@ class WebhookToolFactory:
         self, tool: ToolSchema
     ):
         self.tool = tool
-
-    def remove_nulls(self, obj):
-        """
-        Recursively remove keys with null (None) values from dicts/lists.
-        """
-        if isinstance(obj, dict):
-            return {k: self.remove_nulls(v) for k, v in obj.items() if v is not None}
-        elif isinstance(obj, list):
-            return [self.remove_nulls(v) for v in obj if v is not None]
-        else:
-            return obj
-
-    def to_ascii(self, text: str) -> str:
-        # Normalize to NFKD form, which separates accents from letters
-        normalized = unicodedata.normalize("NFKD", text)
-        # Encode to ASCII, ignoring characters that can't be converted, then decode back to str
-        return normalized.encode("ascii", "ignore").decode("ascii")
+        # Split the URL template once per build into (literal, field) pairs so
+        # each call only has to join the quoted path params back in.
+        self._url_segments = [
+            (literal, field)
+            for literal, field, _, _ in string.Formatter().parse(tool.webhook_url or "")
+        ]
+        self._has_body = tool.webhook_body_params_schema is not None
+        self._headers = tool.webhook_auth_header
+        # The body is serialized with orjson and sent as raw content, so the
+        # content type has to be set explicitly.
+        self._body_headers = {**(tool.webhook_auth_header or {}), "Content-Type": "application/json"}
 
     def create_input_schema(self):
         json_schema = {
@@ -58,17 +112,28 @@ class WebhookToolFactory:
             "properties": {}
         }
         if self.tool.webhook_path_params_schema:
-            json_schema["properties"]["path_params"] = self.remove_nulls(
+            json_schema["properties"]["path_params"] = remove_nulls(
                 self.tool.webhook_path_params_schema)
         if self.tool.webhook_query_params_schema:
-            json_schema["properties"]["query_params"] = self.remove_nulls(
+            json_schema["properties"]["query_params"] = remove_nulls(
                 self.tool.webhook_query_params_schema)
         if self.tool.webhook_body_params_schema:
-            json_schema["properties"]["body_params"] = self.remove_nulls(
+            json_schema["properties"]["body_params"] = remove_nulls(
                 self.tool.webhook_body_params_schema)
         return json_schema
 
     def create_tool(self):
+        # Bind everything the call needs to plain locals so the closure does not
+        # hold on to self. They are deliberately not default arguments:
+        # from_schema forwards the model's arguments as keyword arguments, so
+        # defaults could be overridden by the model (e.g. the URL).
+        webhook_url = self.tool.webhook_url
+        http_method = self.tool.webhook_http_method
+        tool_name = self.tool.name
+        url_segments = self._url_segments
+        has_body = self._has_body
+        auth_headers = self._headers
+        body_headers = self._body_headers
 
         async def tool_function(
             ctx: RunContext[BasicDependencies],
@@ -78,71 +143,69 @@ class WebhookToolFactory:
         ) -> Dict[str, Any]:
             """Execute the webhook call with the provided arguments."""
 
-            if not self.tool.webhook_url:
-                return {"error": f"No webhook URL configured for tool '{self.tool.name}'"}
+            if not webhook_url:
+                return {"error": f"No webhook URL configured for tool '{tool_name}'"}
 
-            final_webhook_url = self.tool.webhook_url
+            final_webhook_url = webhook_url
             if path_params is not None:
-                for key, value in path_params.items():
-                    path_params[key] = quote(value)
-                final_webhook_url = final_webhook_url.format(**path_params)
+                final_webhook_url = "".join(
+                    literal + (quote(str(path_params[field])) if field is not None else "")
+                    for literal, field in url_segments
+                )
 
+            params = None
             if query_params is not None:
-                params = ""
-                for key, value in query_params.items():
-                    if value is not None:
-                        params += f"{quote(key)}={quote(value)}&"
-                final_webhook_url = final_webhook_url + \
-                    "?" + params.rstrip("&")
+                params = {key: value for key, value in query_params.items() if value is not None}
 
-            request_data = None
-            if self.tool.webhook_body_params_schema is not None:
-                request_data = body_params if body_params is not None else {}
-
-            headers = None
-            if self.tool.webhook_auth_header is not None:
-                headers = self.tool.webhook_auth_header
+            request_content = None
+            headers = auth_headers
+            if has_body:
+                request_content = orjson.dumps(body_params if body_params is not None else {})
+                headers = body_headers
 
             success = False
             error_message = None
             result = None
             response = None
-            async with httpx.AsyncClient() as client:
-                try:
-                    response = await client.request(
-                        method=self.tool.webhook_http_method,
-                        url=final_webhook_url,
-                        json=request_data,
-                        headers=headers,
-                        timeout=30.0
-                    )
-                    response.raise_for_status()
-
-                    success = True
+            try:
+                response = await send_webhook_request(
+                    http_method,
+                    url=final_webhook_url,
+                    params=params,
+                    content=request_content,
+                    headers=headers,
+                    timeout=HTTP_TIMEOUTS["webhook"]
+                )
+                response.raise_for_status()
+
+                success = True
+                # Only try to parse bodies that claim to be JSON; anything else is
+                # returned as text without a failed decode first.
+                if "json" in response.headers.get("content-type", ""):
                     try:
-                        result = {
-                            "result": response.json(),
-                            "status_code": response.status_code
-                        }
-                    except json.JSONDecodeError:
-                        result = {
-                            "result": response.text,
-                            "status_code": response.status_code
-                        }
-
-                except httpx.RequestError as e:
-                    success = False
-                    error_message = f"Request failed: {str(e)}"
-                    result = {
-                        "error": f"Request failed: {str(e)}"
-                    }
-                except httpx.HTTPStatusError as e:
-                    success = True
-                    error_message = f"HTTP {e.response.status_code}: {e.response.text}"
-                    result = {
-                        "error": f"HTTP {e.response.status_code}: {e.response.text}",
-                        "status_code": e.response.status_code
-                    }
+                        response_body = orjson.loads(response.content)
+                    except orjson.JSONDecodeError:
+                        response_body = response.text
+                else:
+                    response_body = response.text
+                result = {
+                    "result": response_body,
+                    "status_code": response.status_code
+                }
+
+            except httpx.RequestError as e:
+                success = False
+                error_message = f"Request failed: {str(e)}"
+                result = {
+                    "error": f"Request failed: {str(e)}"
+                }
+            except httpx.HTTPStatusError as e:
+                success = True
+                error_message = f"HTTP {e.response.status_code}: {e.response.text}"
+                result = {
+                    "error": f"HTTP {e.response.status_code}: {e.response.text}",
+                    "status_code": e.response.status_code
+                }
 
             return result
 
@@ -150,14 +213,14 @@ class WebhookToolFactory:
             json_schema = self.create_input_schema()
             return PydanticTool.from_schema(
                 function=tool_function,
-                name=self.to_ascii(self.tool.name.lower().replace(' ', '_')),
+                name=_to_ascii_slug(self.tool.name),
                 description=self.tool.description or f"Execute {self.tool.name}",
                 json_schema=json_schema,
                 takes_ctx=True
             )
-        except Exception as e:
-            print(e, flush=True)
-            raise e
+        except Exception:
+            logger.exception("Failed to build webhook tool %s", self.tool.name)
+            raise
 
     def _json_schema_to_python_type(self, field_schema: Dict[str, Any]) -> Type:
         """Convert JSON Schema type to Python type."""
@@ -183,30 +246,38 @@ class AgentToolFactory:
         self.agent_id = agent_id
         self.tool = tool
 
-    def to_ascii(self, text: str) -> str:
-        # Normalize to NFKD form, which separates accents from letters
-        normalized = unicodedata.normalize("NFKD", text)
-        # Encode to ASCII, ignoring characters that can't be converted, then decode back to str
-        return normalized.encode("ascii", "ignore").decode("ascii")
-
     def create_tool(self):
+        # Imported here rather than at module level because chat.AgentManager
+        # imports this module; binding it once keeps the import off each call.
+        from src.modules.chat.AgentManager import get_agent_manager
 
         async def agent_tool_function(ctx: RunContext[BasicDependencies], query: str) -> str:
-            from src.modules.chat.AgentManager import AgentManager
             response = None
             async with session_manager_provider.get_session_manager().session() as session:
                 try:
-                    from src.modules.chat.AgentManager import get_agent_manager
-                    agent_repo = await get_agent_repository(session, self.agent_id)
-                    agent_manager = await get_agent_manager(session, agent_repo)
-                    response = await agent_manager.get_response(query, [])
+                    updated_at = await session.scalar(
+                        select(Agent.updated_at).where(Agent.id == self.agent_id, Agent.is_active == True)
+                    )
+                    cache_key = (self.agent_id, updated_at)
+                    agent_manager = _agent_manager_cache.get(cache_key) if updated_at else None
+                    if agent_manager is None:
+                        agent_repo = await get_agent_repository(session, self.agent_id)
+                        agent_manager = await get_agent_manager(session, agent_repo)
+                        # A manager holding an MCP server toolset is not shared
+                        # between concurrent calls (see get_pydantic_toolset).
+                        if not any(
+                            isinstance(toolset, MCPServerStreamableHTTP)
+                            for toolset in agent_manager.toolsets
+                        ):
+                            _agent_manager_cache[cache_key] = agent_manager
                 except Exception as e:
                     raise e
+            response = await agent_manager.get_response(query, [])
             return response.response
 
         return PydanticTool.from_schema(
             function=agent_tool_function,
-            name=self.to_ascii(self.name.lower().replace(' ', '_')),
+            name=_to_ascii_slug(self.name),
             description=(self.description) or f"Execute {self.name}",
             json_schema={
                 "type": "object",
@@ -226,34 +297,68 @@ class ToolFactory:
 
     @staticmethod
     def get_pydantic_function_tool(tool: ToolSchema) -> PydanticTool:
+        cache_key = (tool.id, tool.updated_at)
+        with _tool_cache_lock:
+            cached = _tool_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        pydantic_tool = None
         if tool.tool_type == ToolTypeEnum.WEBHOOK:
-            webhook_tool = WebhookToolFactory(
+            pydantic_tool = WebhookToolFactory(
                 tool=tool
             ).create_tool()
-            return webhook_tool
         elif tool.tool_type == ToolTypeEnum.AGENT:
-            agent_tool = AgentToolFactory(
+            pydantic_tool = AgentToolFactory(
                 name=tool.name,
                 description=tool.description,
                 tool=tool,
                 agent_id=tool.target_agent_id
             ).create_tool()
-            return agent_tool
+
+        if pydantic_tool is not None:
+            with _tool_cache_lock:
+                _tool_cache[cache_key] = pydantic_tool
+        return pydantic_tool
 
 
 class ToolsetFactory:
 
     @staticmethod
     async def get_pydantic_toolset(toolset: ToolsetSchema) -> Union[FunctionToolset, MCPServerStreamableHTTP]:
+        """
+        Build the pydantic-ai toolset for a toolset schema.
+
+        toolset.tools must already be materialized (ToolsetRepository eager
+        loads them), so building the tools never goes back to the database.
+        """
+        pydantic_toolset = None
         if toolset.toolset_type == ToolsetTypeEnum.MCP_SERVER:
-            server = MCPServerStreamableHTTP(
+            # Never cached: the MCP client holds a session whose enter/exit is
+            # tied to the task running the agent, so each run needs its own.
+            pydantic_toolset = MCPServerStreamableHTTP(
                 url=toolset.mcp_server_url,
                 headers=toolset.mcp_server_auth_header if toolset.mcp_server_auth_header else None
             )
-            return server
 
         elif toolset.toolset_type == ToolsetTypeEnum.CUSTOM:
-            return FunctionToolset(
-                [ToolFactory.get_pydantic_function_tool(
-                    tool) for tool in toolset.tools]
-            )
\ No newline at end of file
+            # Editing a tool does not touch its toolset's updated_at, so the
+            # tool versions are part of the key as well.
+            cache_key = (
+                toolset.id,
+                toolset.updated_at,
+                tuple((tool.id, tool.updated_at) for tool in toolset.tools),
+            )
+            cached = _toolset_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            # Build the tools concurrently in worker threads so a large toolset
+            # does not block the event loop while their schemas are compiled.
+            tools = await asyncio.gather(*(
+                asyncio.to_thread(ToolFactory.get_pydantic_function_tool, tool)
+                for tool in toolset.tools
+            ))
+            pydantic_toolset = FunctionToolset(list(tools))
+            _toolset_cache[cache_key] = pydantic_toolset
+        return pydantic_toolset
\ No newline at end of file
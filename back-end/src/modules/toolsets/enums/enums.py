@@ -23,11 +23,11 @@ class ToolsetTypeEnum(Enum):
 
     @classmethod
     def get_field_names(cls):
-        return [field.name for field in cls if field.value.is_visible]
+        return list(cls._field_names)
 
     @classmethod
     def get_visible_types(cls):
-        return [field for field in cls if field.value.is_visible]
+        return cls._visible_types
 
     def __str__(self) -> str:
         return str(self.name)
@@ -36,6 +36,15 @@ class ToolsetTypeEnum(Enum):
         return str(self.name)
 
 
+# Members never change after class creation, so the visible ones are computed once.
+ToolsetTypeEnum._visible_types = tuple(field for field in ToolsetTypeEnum if field.value.is_visible)
+ToolsetTypeEnum._field_names = tuple(field.name for field in ToolsetTypeEnum._visible_types)
+# Plain dict lookups by name, skipping EnumMeta.__getitem__ on hot paths.
+TOOLSET_TYPE_BY_NAME = {field.name: field for field in ToolsetTypeEnum}
+# Names accepted from clients, in declaration order (for error messages).
+VISIBLE_TOOLSET_TYPE_NAMES = ToolsetTypeEnum._field_names
+
+
 class ToolTypeEnum(Enum):
     AGENT = ToolsetEnumField("AGENT")
     WEBHOOK = ToolsetEnumField("WEBHOOK")
@@ -43,14 +52,20 @@ class ToolTypeEnum(Enum):
 
     @classmethod
     def get_field_names(cls):
-        return [field.name for field in cls if field.value.is_visible]
+        return list(cls._field_names)
 
     @classmethod
     def get_visible_types(cls):
-        return [field for field in cls if field.value.is_visible]
+        return cls._visible_types
 
     def __str__(self) -> str:
         return str(self.name)
 
     def __repr__(self) -> str:
         return str(self.name)
+
+
+ToolTypeEnum._visible_types = tuple(field for field in ToolTypeEnum if field.value.is_visible)
+ToolTypeEnum._field_names = tuple(field.name for field in ToolTypeEnum._visible_types)
+TOOL_TYPE_BY_NAME = {field.name: field for field in ToolTypeEnum}
+VISIBLE_TOOL_TYPE_NAMES = ToolTypeEnum._field_names
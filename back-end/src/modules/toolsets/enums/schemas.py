@@ -2,14 +2,25 @@ from typing import Optional
 
 from pydantic import BaseModel, Field, model_validator, field_validator
 
-from src.modules.toolsets.enums.enums import ToolsetTypeEnum, ToolTypeEnum
+from src.modules.toolsets.enums.enums import (
+    TOOL_TYPE_BY_NAME,
+    TOOLSET_TYPE_BY_NAME,
+    VISIBLE_TOOL_TYPE_NAMES,
+    VISIBLE_TOOLSET_TYPE_NAMES,
+    ToolsetTypeEnum,
+    ToolTypeEnum,
+)
+
+# Membership checks use sets; the name tuples keep the order for messages.
+_ALLOWED_TOOLSET_TYPES = frozenset(VISIBLE_TOOLSET_TYPE_NAMES)
+_ALLOWED_TOOL_TYPES = frozenset(VISIBLE_TOOL_TYPE_NAMES)
 
 
 class ToolsetTypeSchema(BaseModel):
     toolset_type: Optional[str] = Field(
         description=(
             "The type of the toolset. "
-            f"Allowed values: {ToolsetTypeEnum.get_field_names()}."
+            f"Allowed values: {list(VISIBLE_TOOLSET_TYPE_NAMES)}."
         )
     )
     _toolset_type: Optional[ToolsetTypeEnum] = None
@@ -19,16 +30,15 @@ class ToolsetTypeSchema(BaseModel):
     def validate_toolset_type(cls, value: Optional[str]) -> Optional[str]:
         if value is None:
             return value
-        allowed = [field.name for field in ToolsetTypeEnum.get_visible_types()]
-        if value not in allowed:
-            allowed_str = ", ".join(allowed)
+        if value not in _ALLOWED_TOOLSET_TYPES:
+            allowed_str = ", ".join(VISIBLE_TOOLSET_TYPE_NAMES)
             raise ValueError(f"toolset_type must be one of: {allowed_str}")
         return value
 
     @model_validator(mode="after")
     def set_toolset_type(self):
         if self.toolset_type is not None:
-            self._toolset_type = ToolsetTypeEnum[self.toolset_type]
+            self._toolset_type = TOOLSET_TYPE_BY_NAME[self.toolset_type]
         return self
 
     @property
@@ -40,7 +50,7 @@ class ToolTypeSchema(BaseModel):
     tool_type: Optional[str] = Field(
         description=(
             "The type of the tool. "
-            f"Allowed values: {ToolTypeEnum.get_field_names()}."
+            f"Allowed values: {list(VISIBLE_TOOL_TYPE_NAMES)}."
         )
     )
     _tool_type: Optional[ToolTypeEnum] = None
@@ -50,16 +60,15 @@ class ToolTypeSchema(BaseModel):
     def validate_tool_type(cls, value: Optional[str]) -> Optional[str]:
         if value is None:
             return value
-        allowed = [field.name for field in ToolTypeEnum.get_visible_types()]
-        if value not in allowed:
-            allowed_str = ", ".join(allowed)
+        if value not in _ALLOWED_TOOL_TYPES:
+            allowed_str = ", ".join(VISIBLE_TOOL_TYPE_NAMES)
             raise ValueError(f"tool_type must be one of: {allowed_str}")
         return value
 
     @model_validator(mode="after")
     def set_tool_type(self):
         if self.tool_type is not None:
-            self._tool_type = ToolTypeEnum[self.tool_type]
+            self._tool_type = TOOL_TYPE_BY_NAME[self.tool_type]
         return self
 
     @property
@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import Integer, String, ForeignKey, Boolean,  DateTime, func, Index, Text
+from sqlalchemy import BigInteger, Integer, String, ForeignKey, Boolean,  DateTime, func, Index, Text
 from sqlalchemy.orm import relationship, mapped_column
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 
@@ -8,6 +8,8 @@ from src.database.session_manager import Base
 
 class Toolset(Base):
     __tablename__ = 'toolset'
+    # Fetch created_at/updated_at with RETURNING on flush instead of a refresh.
+    __mapper_args__ = {"eager_defaults": True}
     
     id = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     enum_toolset_type = mapped_column(String, nullable=False) # Literal: "NP Toolset", "MCP Server", "Custom", "NP Custom Toolset"
@@ -22,6 +24,17 @@ class Toolset(Base):
     is_active = mapped_column(Boolean, nullable=False, default=True)
     created_at = mapped_column(DateTime, nullable=False, default=func.now())
     updated_at = mapped_column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
+    # Incremented by every write to this toolset or its tools (see
+    # bump_toolset_revision); versions its HTTP responses.
+    revision = mapped_column(BigInteger, nullable=False, default=1, server_default="1")
+
+    tools = relationship("Tool", back_populates="toolset")
+    # Read-only view of the active tools, filtered in SQL; used for eager loading.
+    active_tools = relationship(
+        "Tool",
+        primaryjoin="and_(Toolset.id == foreign(Tool.toolset_id), Tool.is_active == True)",
+        viewonly=True,
+    )
 
     def __str__(self):
         return self.name
@@ -29,6 +42,8 @@ class Toolset(Base):
 
 class Tool(Base):
     __tablename__ = 'tool'
+    # Fetch created_at/updated_at with RETURNING on flush instead of a refresh.
+    __mapper_args__ = {"eager_defaults": True}
     
     id = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     enum_tool_type = mapped_column(String, nullable=False) # Literal: "Webhook", "Agent", "MCP"
@@ -56,7 +71,7 @@ class Tool(Base):
     target_agent_id = mapped_column(UUID(as_uuid=True), ForeignKey('agent.id'), nullable=True)
     toolset_id = mapped_column(UUID(as_uuid=True), ForeignKey('toolset.id'), nullable=True)
 
-    toolset = relationship("Toolset")
+    toolset = relationship("Toolset", back_populates="tools")
 
     def __str__(self):
         return self.name
@@ -64,3 +79,4 @@ class Tool(Base):
 
 # Database indexes for performance
 Index('idx_tool_toolset_id', Tool.toolset_id)
+Index('idx_toolset_active_created_at_id', Toolset.is_active, Toolset.created_at.desc(), Toolset.id.desc())
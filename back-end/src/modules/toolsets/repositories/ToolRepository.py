@@ -1,17 +1,72 @@
-from typing import Optional
-from uuid import UUID
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, selectinload
 
-from src.modules.toolsets.enums.enums import ToolTypeEnum
+from src.modules.toolsets.enums.enums import TOOL_TYPE_BY_NAME, ToolTypeEnum
 
-from ..models import Tool
+from ..models import Tool, Toolset
 from ..schemas import ToolSchema
 
 
+_WEBHOOK_SCHEMA_COLUMNS = (
+    "webhook_query_params_schema",
+    "webhook_path_params_schema",
+    "webhook_body_params_schema",
+)
+
+
+def remove_nulls(obj):
+    """
+    Return a copy of obj with null (None) values removed from every nested dict/list.
+
+    Walks the structure with an explicit stack instead of recursing.
+    """
+    if not isinstance(obj, (dict, list)):
+        return obj
+    root = {} if isinstance(obj, dict) else []
+    stack = [(obj, root)]
+    while stack:
+        source, target = stack.pop()
+        items = source.items() if isinstance(source, dict) else enumerate(source)
+        for key, value in items:
+            if value is None:
+                continue
+            if isinstance(value, (dict, list)):
+                child = {} if isinstance(value, dict) else []
+                stack.append((value, child))
+            else:
+                child = value
+            if isinstance(target, dict):
+                target[key] = child
+            else:
+                target.append(child)
+    return root
+
+
+async def bump_toolset_revision(session: AsyncSession, toolset_id: UUID) -> None:
+    """
+    Increment a toolset's revision after a write to it or to one of its tools.
+
+    ToolsetRepository and ToolRepository call this on every write, so the
+    revision versions the toolset's HTTP responses. The row lock it takes until
+    commit only covers that toolset.
+    """
+    await session.execute(
+        update(Toolset)
+        .where(Toolset.id == toolset_id)
+        # Setting updated_at to itself keeps its onupdate from firing: a tool
+        # edit does not change the toolset row itself.
+        .values(revision=Toolset.revision + 1, updated_at=Toolset.updated_at)
+        # Loaded toolsets are left as they are: nothing reads revision from
+        # them, and expiring them would force a lazy reload.
+        .execution_options(synchronize_session=False)
+    )
+
+
 async def get_tool_repository(session: AsyncSession, tool_id: UUID) -> "ToolRepository":
     """
     Factory to create a ToolRepository instance and load an existing tool.
@@ -102,7 +157,9 @@ class ToolRepository:
     async def load(self, tool_id: UUID):
         stmt = (
             select(Tool)
-            .options(selectinload(Tool.toolset))
+            # Bring the parent toolset and its tools along so callers that
+            # also need the toolset (update_tool) do not go back to the database.
+            .options(joinedload(Tool.toolset).selectinload(Toolset.active_tools))
             .where(Tool.id == tool_id, Tool.is_active == True)
         )
         result = await self.session.execute(stmt)
@@ -137,9 +194,9 @@ class ToolRepository:
             enum_tool_type=tool_type.name,
             webhook_url=webhook_url,
             webhook_auth_header=webhook_auth_header,
-            webhook_query_params_schema=webhook_query_params_schema,
-            webhook_path_params_schema=webhook_path_params_schema,
-            webhook_body_params_schema=webhook_body_params_schema,
+            webhook_query_params_schema=remove_nulls(webhook_query_params_schema),
+            webhook_path_params_schema=remove_nulls(webhook_path_params_schema),
+            webhook_body_params_schema=remove_nulls(webhook_body_params_schema),
             webhook_http_method=webhook_http_method,
             mcp_title=mcp_title,
             input_schema=input_schema,
@@ -150,7 +207,8 @@ class ToolRepository:
 
         self.session.add(tool)
         await self.session.flush()
-        await self.session.refresh(tool)
+        if toolset_id:
+            await bump_toolset_revision(self.session, toolset_id)
         self.tool = tool
         self.tool_schema = self.create_tool_schema(self.tool)
         return self
@@ -186,11 +244,11 @@ class ToolRepository:
         if webhook_auth_header is not None:
             self.tool.webhook_auth_header = webhook_auth_header
         if webhook_query_params_schema is not None:
-            self.tool.webhook_query_params_schema = webhook_query_params_schema
+            self.tool.webhook_query_params_schema = remove_nulls(webhook_query_params_schema)
         if webhook_path_params_schema is not None:
-            self.tool.webhook_path_params_schema = webhook_path_params_schema
+            self.tool.webhook_path_params_schema = remove_nulls(webhook_path_params_schema)
         if webhook_body_params_schema is not None:
-            self.tool.webhook_body_params_schema = webhook_body_params_schema
+            self.tool.webhook_body_params_schema = remove_nulls(webhook_body_params_schema)
         if webhook_http_method is not None:
             self.tool.webhook_http_method = webhook_http_method
         if mcp_title is not None:
@@ -203,7 +261,8 @@ class ToolRepository:
             self.tool.target_agent_id = target_agent_id
 
         await self.session.flush()
-        await self.session.refresh(self.tool)
+        if self.tool.toolset_id:
+            await bump_toolset_revision(self.session, self.tool.toolset_id)
         self.tool_schema = self.create_tool_schema(self.tool)
         return self
 
@@ -212,17 +271,55 @@ class ToolRepository:
             raise RuntimeError("Tool repository is not initialized.")
         self.tool.is_active = False
         await self.session.flush()
-        await self.session.refresh(self.tool)
+        if self.tool.toolset_id:
+            await bump_toolset_revision(self.session, self.tool.toolset_id)
         return self
 
+    @staticmethod
+    async def bulk_create(session: AsyncSession, rows: List[Dict[str, Any]]) -> List[Tool]:
+        """
+        Insert many tools with a single executemany INSERT ... RETURNING.
+
+        Each row maps Tool column names to values. The inserted rows come back
+        as Tool instances in the session, so no follow-up SELECT is needed.
+        """
+        if not rows:
+            return []
+        rows = [{"id": uuid4(), **row} for row in rows]
+        for row in rows:
+            for key in _WEBHOOK_SCHEMA_COLUMNS:
+                if key in row:
+                    row[key] = remove_nulls(row[key])
+        result = await session.scalars(insert(Tool).returning(Tool, sort_by_parameter_order=True), rows)
+        tools = list(result.all())
+        for toolset_id in {row["toolset_id"] for row in rows if row.get("toolset_id")}:
+            await bump_toolset_revision(session, toolset_id)
+        return tools
+
+    @staticmethod
+    async def get_tool_version(session: AsyncSession, tool_id: UUID) -> Optional[Tuple[Optional[UUID], Optional[int]]]:
+        """
+        Return (toolset_id, toolset revision) for the tool, None if it does not
+        exist, for HTTP caching. Every tool write bumps its toolset's revision.
+        """
+        stmt = (
+            select(Tool.toolset_id, Toolset.revision)
+            .outerjoin(Toolset, Toolset.id == Tool.toolset_id)
+            .where(Tool.id == tool_id, Tool.is_active == True)
+        )
+        result = await session.execute(stmt)
+        row = result.one_or_none()
+        return tuple(row) if row else None
+
     def get_tool(self) -> ToolSchema:
         return self.tool_schema
 
     @staticmethod
     def create_tool_schema(tool: Tool) -> ToolSchema:
-        return ToolSchema(
+        # Built from an ORM row, which is already typed, so skip pydantic validation.
+        return ToolSchema.model_construct(
             id=tool.id,
-            tool_type=ToolTypeEnum[tool.enum_tool_type],
+            tool_type=TOOL_TYPE_BY_NAME[tool.enum_tool_type],
             name=tool.name,
             description=tool.description,
             webhook_url=tool.webhook_url,
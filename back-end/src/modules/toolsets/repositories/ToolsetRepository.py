@@ -1,15 +1,47 @@
-from typing import Dict, List, Optional
+import base64
+import binascii
+from typing import List, Optional, Tuple
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import select, func
+from sqlalchemy import Integer, bindparam, select, func, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, raiseload, selectinload
 
-from src.modules.toolsets.enums.enums import ToolsetTypeEnum
+from src.modules.toolsets.enums.enums import TOOLSET_TYPE_BY_NAME, ToolsetTypeEnum
 
 from ..models import Toolset, Tool
 from ..schemas import ToolSchema, ToolsetSchema
-from .ToolRepository import ToolRepository
+from .ToolRepository import ToolRepository, bump_toolset_revision
+
+
+# Built once at import so the per-request lookups reuse a single cached compiled form.
+# A single toolset joins its (few) tools in the same round trip; the page
+# queries keep selectinload to avoid multiplying toolset rows.
+_active_toolset_stmt = (
+    select(Toolset)
+    .options(joinedload(Toolset.active_tools), raiseload("*"))
+    .where(Toolset.id == bindparam("toolset_id"), Toolset.is_active == True)
+    # Tools may have been inserted in this session after the toolset was
+    # first loaded (e.g. create_toolset), so re-read the collection.
+    .execution_options(populate_existing=True)
+)
+_toolsets_page_stmt = (
+    select(Toolset, func.count().over().label("total"))
+    .options(selectinload(Toolset.active_tools), raiseload("*"))
+    .where(Toolset.is_active == True)
+    .offset(bindparam("offset", type_=Integer))
+    .limit(bindparam("limit", type_=Integer))
+    .order_by(Toolset.created_at.desc(), Toolset.id.desc())
+)
+_count_active_toolsets_stmt = select(func.count(Toolset.id)).where(Toolset.is_active == True)
+# Revisions only ever grow and every write bumps one (a new toolset starts at
+# 1), so the sum over all rows, deleted ones included, changes with every
+# committed write. A max would miss an edit to any toolset but the newest.
+_catalog_revision_stmt = select(func.coalesce(func.sum(Toolset.revision), 0))
+_toolset_revision_stmt = select(Toolset.revision).where(
+    Toolset.id == bindparam("toolset_id"), Toolset.is_active == True
+)
 
 
 async def get_toolset_repository(session: AsyncSession, toolset_id: UUID) -> "ToolsetRepository":
@@ -67,21 +99,33 @@ class ToolsetRepository:
     Repository for managing Toolset entities.
 
     Handles CRUD operations for toolsets and loading of associated tools.
+    Toolset queries eager-load tools and raiseload everything else, so a
+    relationship touched during serialization fails loudly instead of
+    issuing one lazy query per row.
     """
     def __init__(self, session: AsyncSession):
         self.session = session
         self.toolset: Optional[Toolset] = None
         self._tools: List[Tool] = []
 
+    @classmethod
+    def from_loaded(cls, session: AsyncSession, toolset: Optional[Toolset]) -> "ToolsetRepository":
+        """Wrap a toolset whose active_tools are already loaded, without querying."""
+        if not toolset or not toolset.is_active:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Toolset not found")
+        repo = cls(session)
+        repo.toolset = toolset
+        repo._tools = list(toolset.active_tools)
+        repo.toolset_schema = repo.create_toolset_schema(repo.toolset, repo._tools)
+        return repo
+
     async def load(self, toolset_id: UUID):
-        stmt = select(Toolset).where(Toolset.id == toolset_id, Toolset.is_active == True)
-        result = await self.session.execute(stmt)
-        toolset = result.scalar_one_or_none()
+        result = await self.session.execute(_active_toolset_stmt, {"toolset_id": toolset_id})
+        toolset = result.unique().scalar_one_or_none()
         if not toolset:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Toolset not found")
         self.toolset = toolset
-        tool_map = await self._fetch_tools_map(self.session, [toolset.id])
-        self._tools = tool_map.get(toolset.id, [])
+        self._tools = list(toolset.active_tools)
         self.toolset_schema = self.create_toolset_schema(self.toolset, self._tools)
         return self
 
@@ -103,7 +147,6 @@ class ToolsetRepository:
         )
         self.session.add(toolset)
         await self.session.flush()
-        await self.session.refresh(toolset)
         self.toolset = toolset
         self._tools = []
         self.toolset_schema = self.create_toolset_schema(self.toolset, self._tools)
@@ -133,7 +176,7 @@ class ToolsetRepository:
             self.toolset.mcp_server_auth_header = mcp_server_auth_header
 
         await self.session.flush()
-        await self.session.refresh(self.toolset)
+        await bump_toolset_revision(self.session, self.toolset.id)
         self.toolset_schema = self.create_toolset_schema(self.toolset, self._tools)
         return self
 
@@ -142,7 +185,15 @@ class ToolsetRepository:
             raise RuntimeError("Toolset repository is not initialized.")
         self.toolset.is_active = False
         await self.session.flush()
-        await self.session.refresh(self.toolset)
+        await bump_toolset_revision(self.session, self.toolset.id)
+        return self
+
+    def set_tools(self, tools: List[Tool]):
+        """Attach tools created in this session and rebuild the schema from memory."""
+        if not self.toolset:
+            raise RuntimeError("Toolset repository is not initialized.")
+        self._tools = tools
+        self.toolset_schema = self.create_toolset_schema(self.toolset, self._tools)
         return self
 
     def get_toolset(self) -> ToolsetSchema:
@@ -151,43 +202,108 @@ class ToolsetRepository:
     @staticmethod
     async def paginate_toolsets(
         session: AsyncSession, page_number: int, page_size: int
-    ) -> List[ToolsetSchema]:
+    ) -> Tuple[List[ToolsetSchema], int]:
+        """
+        Offset pagination, newest first. Returns the page and the total number
+        of active toolsets, counted by a window function in the same query.
+        """
         offset = (page_number - 1) * page_size
+        result = await session.execute(
+            _toolsets_page_stmt, {"offset": offset, "limit": page_size}
+        )
+        rows = result.all()
+        if rows:
+            total = rows[0].total
+        elif offset:
+            # Past the last page there is no row to carry the window count.
+            total = await ToolsetRepository.count_toolsets(session)
+        else:
+            total = 0
+        return (
+            [ToolsetRepository.create_toolset_schema(row.Toolset, row.Toolset.active_tools) for row in rows],
+            total,
+        )
+
+    @staticmethod
+    async def cursor_paginate_toolsets(
+        session: AsyncSession, cursor: Optional[str], page_size: int
+    ) -> Tuple[List[ToolsetSchema], Optional[str]]:
+        """
+        Keyset pagination over (created_at, id), newest first.
+
+        Returns the page and the cursor for the next one (None on the last page).
+        """
         stmt = (
             select(Toolset)
+            .options(selectinload(Toolset.active_tools), raiseload("*"))
             .where(Toolset.is_active == True)
-            .offset(offset)
-            .limit(page_size)
-            .order_by(Toolset.created_at.desc())
+            .order_by(Toolset.created_at.desc(), Toolset.id.desc())
+            .limit(page_size + 1)
         )
+        if cursor is not None:
+            cursor_id = ToolsetRepository.decode_cursor(cursor)
+            # Compare against the cursor row's stored created_at rather than a
+            # timestamp round-tripped through the cursor, so precision and
+            # driver formatting can never shift the boundary.
+            cursor_created_at = (
+                select(Toolset.created_at).where(Toolset.id == cursor_id).scalar_subquery()
+            )
+            stmt = stmt.where(
+                tuple_(Toolset.created_at, Toolset.id) < tuple_(cursor_created_at, cursor_id)
+            )
         result = await session.execute(stmt)
         toolsets = result.scalars().all()
-        tool_map = await ToolsetRepository._fetch_tools_map(session, [ts.id for ts in toolsets])
-        return [
-            ToolsetRepository.create_toolset_schema(toolset, tool_map.get(toolset.id, []))
-            for toolset in toolsets
-        ]
+        next_cursor = None
+        if len(toolsets) > page_size:
+            toolsets = toolsets[:page_size]
+            next_cursor = ToolsetRepository.encode_cursor(toolsets[-1].id)
+        return (
+            [ToolsetRepository.create_toolset_schema(toolset, toolset.active_tools) for toolset in toolsets],
+            next_cursor,
+        )
+
+    @staticmethod
+    def encode_cursor(toolset_id: UUID) -> str:
+        return base64.urlsafe_b64encode(toolset_id.bytes).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> UUID:
+        try:
+            return UUID(bytes=base64.urlsafe_b64decode(cursor.encode()))
+        except (binascii.Error, ValueError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+    @staticmethod
+    async def get_toolset_version(session: AsyncSession, toolset_id: UUID) -> Optional[int]:
+        """Revision of a toolset and its tools (None if it does not exist), for HTTP caching."""
+        result = await session.execute(_toolset_revision_stmt, {"toolset_id": toolset_id})
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def get_toolsets_version(session: AsyncSession) -> int:
+        """Sum of every toolset's revision, covering all toolsets and tools, for HTTP caching."""
+        result = await session.execute(_catalog_revision_stmt)
+        return result.scalar_one()
 
     @staticmethod
     async def count_toolsets(session: AsyncSession) -> int:
-        stmt = select(func.count(Toolset.id)).where(Toolset.is_active == True)
-        result = await session.execute(stmt)
+        result = await session.execute(_count_active_toolsets_stmt)
         return result.scalar_one()
 
     @staticmethod
     def create_toolset_schema(
         toolset: Toolset, tools: Optional[List[Tool]] = None
     ) -> ToolsetSchema:
+        # Callers pass active tools only (loaded through Toolset.active_tools or
+        # just created), so no per-tool filter is needed here.
         serialized_tools: List[ToolSchema] = []
         if tools:
-            serialized_tools = [
-                ToolRepository.create_tool_schema(tool)
-                for tool in tools
-                if tool.is_active
-            ]
-        return ToolsetSchema(
+            build_tool_schema = ToolRepository.create_tool_schema
+            serialized_tools = [build_tool_schema(tool) for tool in tools]
+        # Built from ORM rows, which are already typed, so skip pydantic validation.
+        return ToolsetSchema.model_construct(
             id=toolset.id,
-            toolset_type=ToolsetTypeEnum[toolset.enum_toolset_type],
+            toolset_type=TOOLSET_TYPE_BY_NAME[toolset.enum_toolset_type],
             enum_toolset_type=toolset.enum_toolset_type,
             name=toolset.name,
             description=toolset.description,
@@ -199,18 +315,3 @@ class ToolsetRepository:
             updated_at=toolset.updated_at,
             tools=serialized_tools,
         )
-
-    @staticmethod
-    async def _fetch_tools_map(session: AsyncSession, toolset_ids: List[UUID]) -> Dict[UUID, List[Tool]]:
-        if not toolset_ids:
-            return {}
-        stmt = select(Tool).where(
-            Tool.toolset_id.in_(toolset_ids),
-            Tool.is_active == True,
-        )
-        result = await session.execute(stmt)
-        tools = result.scalars().all()
-        tool_map: Dict[UUID, List[Tool]] = {}
-        for tool in tools:
-            tool_map.setdefault(tool.toolset_id, []).append(tool)
-        return tool_map
@@ -1,12 +1,18 @@
+import hashlib
+from typing import Iterable, Optional, Set
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Query, status
-from sqlalchemy import select
+import orjson
+from cachetools import TTLCache
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database.session_manager import DBSessionDep
+from src.database.session_manager import DBReadSessionDep, DBWriteSessionDep, on_commit
 from src.modules.agents.models import Agent
+from src.modules.toolsets.models import Toolset
 from src.modules.toolsets.MCPManager import MCPManager
+from src.modules.toolsets.ToolFactory import invalidate_toolset
 from src.modules.toolsets.enums.enums import ToolTypeEnum, ToolsetTypeEnum
 from src.modules.toolsets.repositories.ToolRepository import (
     ToolRepository,
@@ -19,6 +25,7 @@ from src.modules.toolsets.repositories.ToolsetRepository import (
     get_toolset_repository,
 )
 from .routes_schemas import (
+    CreateAgentTool,
     CreateTool,
     CreateToolset,
     ToolResponse,
@@ -31,19 +38,104 @@ from .routes_schemas import (
 toolset_router = APIRouter(tags=["Toolset Management"])
 
 
+_active_agent_id_stmt = select(Agent.id).where(
+    Agent.id == bindparam("agent_id"), Agent.is_active == True
+)
+
+
+_active_agent_ids_stmt = select(Agent.id).where(
+    Agent.id.in_(bindparam("agent_ids", expanding=True)), Agent.is_active == True
+)
+
+_active_toolset_type_stmt = select(Toolset.enum_toolset_type).where(
+    Toolset.id == bindparam("toolset_id"), Toolset.is_active == True
+)
+
+# Serialized GET bodies keyed by endpoint and the version their ETag is built
+# from: the toolset id and its revision for a toolset or tool body, the query
+# and the sum of revisions for a list page. A committed write moves the
+# version, so an old entry can never be served for new data; dropping the
+# entries on write and the TTL only keep dead bodies from piling up.
+_response_body_cache: TTLCache = TTLCache(maxsize=512, ttl=3600)
+
+
+def _etag(*version) -> str:
+    digest = hashlib.blake2b("|".join(map(str, version)).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Tag the response with the ETag; return a 304 response when the client
+    already holds this version (If-None-Match), so the caller can skip the load.
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or etag in (tag.strip() for tag in if_none_match.split(","))
+    ):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=dict(response.headers))
+    return None
+
+
+def _drop_cached_bodies(toolset_id: UUID) -> None:
+    """Drop every cached list body and the bodies of the toolset and its tools (safety net)."""
+    for key in [
+        key for key in list(_response_body_cache.keys())
+        if key[0] == "toolsets" or key[1] == toolset_id
+    ]:
+        _response_body_cache.pop(key, None)
+
+
+async def _cached_json_response(response: Response, cache_key: tuple, build) -> Response:
+    """Serve the cached JSON body for cache_key, building and caching it on a miss."""
+    body = _response_body_cache.get(cache_key)
+    if body is None:
+        body = await build()
+        _response_body_cache[cache_key] = body
+    return Response(content=body, media_type="application/json", headers=dict(response.headers))
+
+
+def _invalidate_toolset_on_commit(session: AsyncSession, toolset_id: UUID, tool_ids: Iterable[UUID] = ()) -> None:
+    # The repositories already bumped the toolset's revision. Once committed,
+    # the cached bodies go, and agents must not keep running the old build of
+    # the toolset or its tools.
+    tool_ids = tuple(tool_ids)
+    on_commit(session, lambda: invalidate_toolset(toolset_id, tool_ids))
+    on_commit(session, lambda: _drop_cached_bodies(toolset_id))
+
+
+async def _ensure_custom_toolset(session: AsyncSession, toolset_id: UUID) -> None:
+    result = await session.execute(_active_toolset_type_stmt, {"toolset_id": toolset_id})
+    toolset_type = result.scalar_one_or_none()
+    if toolset_type is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Toolset not found")
+    if toolset_type != ToolsetTypeEnum.CUSTOM.name:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Tools can only be added to CUSTOM toolsets.")
+
+
 async def _ensure_agent_exists(session: AsyncSession, agent_id: UUID) -> None:
-    stmt = select(Agent.id).where(Agent.id == agent_id, Agent.is_active == True)
-    result = await session.execute(stmt)
+    result = await session.execute(_active_agent_id_stmt, {"agent_id": agent_id})
     if not result.scalar_one_or_none():
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Agent not found")
 
 
+async def _ensure_agents_exist(session: AsyncSession, agent_ids: Set[UUID]) -> None:
+    if not agent_ids:
+        return
+    result = await session.execute(_active_agent_ids_stmt, {"agent_ids": list(agent_ids)})
+    if agent_ids - set(result.scalars().all()):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Agent not found")
+
+
 @toolset_router.post(
     "/toolsets",
     status_code=status.HTTP_201_CREATED,
     response_model=ToolsetResponse,
 )
-async def create_toolset(data: CreateToolset, session: DBSessionDep):
+async def create_toolset(data: CreateToolset, session: DBWriteSessionDep):
     """Create a new toolset and optionally set up MCP integration or nested tools."""
     toolset_type = data.enum or ToolsetTypeEnum.CUSTOM
     toolset_repo = await create_toolset_repository(
@@ -61,35 +153,39 @@ async def create_toolset(data: CreateToolset, session: DBSessionDep):
             mcp_server_url=data.mcp_server_url,
             mcp_server_auth_header=data.mcp_server_auth_header,
         )
-        await manager.setup_mcp(session)
+        created_tools = await manager.setup_mcp(session) or []
+    else:
+        created_tools = []
 
     if data.tools:
+        rows = []
+        agent_ids: Set[UUID] = set()
         for tool in data.tools:
-            tool_type = tool.enum
-            if tool_type is None:
-                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="tool_type is required.")
-            if tool_type == ToolTypeEnum.AGENT and tool.target_agent_id:
-                await _ensure_agent_exists(session, tool.target_agent_id)
-            await create_tool_repository(
-                session=session,
-                name=tool.name,
-                description=tool.description,
-                tool_type=tool_type,
-                webhook_url=tool.webhook_url,
-                webhook_auth_header=tool.webhook_auth_header,
-                webhook_query_params_schema=tool.webhook_query_params_schema,
-                webhook_path_params_schema=tool.webhook_path_params_schema,
-                webhook_body_params_schema=tool.webhook_body_params_schema,
-                webhook_http_method=tool.webhook_http_method,
-                mcp_title=None,
-                input_schema=None,
-                output_schema=None,
-                target_agent_id=tool.target_agent_id,
-                toolset_id=toolset_repo.toolset.id if toolset_repo.toolset else None,
-            )
-
-    await toolset_repo.load(toolset_repo.toolset.id)
-    await session.commit()
+            if isinstance(tool, CreateAgentTool):
+                agent_ids.add(tool.target_agent_id)
+            rows.append({
+                "name": tool.name,
+                "description": tool.description,
+                "enum_tool_type": tool.enum.name,
+                "webhook_url": tool.webhook_url,
+                "webhook_auth_header": tool.webhook_auth_header,
+                "webhook_query_params_schema": tool.webhook_query_params_schema,
+                "webhook_path_params_schema": tool.webhook_path_params_schema,
+                "webhook_body_params_schema": tool.webhook_body_params_schema,
+                "webhook_http_method": tool.webhook_http_method,
+                "target_agent_id": tool.target_agent_id,
+                "toolset_id": toolset_repo.toolset.id,
+            })
+        # One existence check for every referenced agent, then one
+        # INSERT ... RETURNING for all nested tools.
+        await _ensure_agents_exist(session, agent_ids)
+        created_tools.extend(await ToolRepository.bulk_create(session, rows))
+
+    _invalidate_toolset_on_commit(session, toolset_repo.toolset.id)
+
+    # Every tool of the new toolset was created above, so build the response
+    # from them instead of reloading the toolset.
+    toolset_repo.set_tools(created_tools)
     response = toolset_repo.get_toolset().model_dump()
     return response
 
@@ -99,34 +195,71 @@ async def create_toolset(data: CreateToolset, session: DBSessionDep):
     response_model=ToolsetListResponse,
 )
 async def list_toolsets(
-    session: DBSessionDep,
+    request: Request,
+    response: Response,
+    session: DBReadSessionDep,
     page_number: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; takes precedence over page_number."),
 ):
     """List toolsets with pagination metadata."""
-    toolsets = await ToolsetRepository.paginate_toolsets(session, page_number, page_size)
-    total = await ToolsetRepository.count_toolsets(session)
-    return ToolsetListResponse(
-        total_toolsets=total,
-        toolsets=[ts.model_dump() for ts in toolsets],
-    )
+    version = await ToolsetRepository.get_toolsets_version(session)
+    etag = _etag(request.url.query, version)
+    not_modified = _not_modified(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    async def build() -> bytes:
+        if cursor is not None:
+            toolsets, next_cursor = await ToolsetRepository.cursor_paginate_toolsets(session, cursor, page_size)
+            total = await ToolsetRepository.count_toolsets(session)
+        else:
+            # Page and total come back from one windowed query.
+            toolsets, total = await ToolsetRepository.paginate_toolsets(session, page_number, page_size)
+            next_cursor = None
+            if toolsets and total > page_number * page_size:
+                next_cursor = ToolsetRepository.encode_cursor(toolsets[-1].id)
+        # Each toolset goes through pydantic's JSON serializer once and is
+        # spliced in as-is, instead of dumping to dicts and validating them
+        # back into ToolsetListResponse.
+        return orjson.dumps({
+            "total_toolsets": total,
+            "toolsets": [
+                orjson.Fragment(ToolsetResponse.from_orm_fast(ts).model_dump_json())
+                for ts in toolsets
+            ],
+            "next_cursor": next_cursor,
+        })
+
+    return await _cached_json_response(response, ("toolsets", request.url.query, version), build)
 
 
 @toolset_router.get(
     "/toolsets/{toolset_id}",
     response_model=ToolsetResponse,
 )
-async def get_toolset(toolset_id: UUID, session: DBSessionDep):
+async def get_toolset(toolset_id: UUID, request: Request, response: Response, session: DBReadSessionDep):
     """Retrieve a toolset by its identifier."""
-    repo = await get_toolset_repository(session, toolset_id)
-    return repo.get_toolset()
+    version = await ToolsetRepository.get_toolset_version(session, toolset_id)
+    if version is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Toolset not found")
+    etag = _etag(toolset_id, version)
+    not_modified = _not_modified(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    async def build() -> bytes:
+        repo = await get_toolset_repository(session, toolset_id)
+        return ToolsetResponse.from_orm_fast(repo.get_toolset()).model_dump_json()
+
+    return await _cached_json_response(response, ("toolset", toolset_id, version), build)
 
 
 @toolset_router.patch(
     "/toolsets/{toolset_id}",
     response_model=ToolsetResponse,
 )
-async def update_toolset(toolset_id: UUID, data: UpdateToolset, session: DBSessionDep):
+async def update_toolset(toolset_id: UUID, data: UpdateToolset, session: DBWriteSessionDep):
     """Update metadata or type information for an existing toolset."""
     repo = await get_toolset_repository(session, toolset_id)
     await repo.update(
@@ -136,7 +269,7 @@ async def update_toolset(toolset_id: UUID, data: UpdateToolset, session: DBSessi
         mcp_server_url=data.mcp_server_url,
         mcp_server_auth_header=data.mcp_server_auth_header,
     )
-    await session.commit()
+    _invalidate_toolset_on_commit(session, toolset_id)
     return repo.get_toolset()
 
 
@@ -144,17 +277,17 @@ async def update_toolset(toolset_id: UUID, data: UpdateToolset, session: DBSessi
     "/toolsets/{toolset_id}",
     status_code=status.HTTP_204_NO_CONTENT,
 )
-async def delete_toolset(toolset_id: UUID, session: DBSessionDep):
+async def delete_toolset(toolset_id: UUID, session: DBWriteSessionDep):
     """Delete a toolset and its associated tools."""
     repo = await get_toolset_repository(session, toolset_id)
     await repo.delete()
-    await session.commit()
+    _invalidate_toolset_on_commit(session, toolset_id, (tool.id for tool in repo.get_toolset().tools))
 
 
 @toolset_router.get(
     "/toolsets/{toolset_id}/mcp-server-auth-header",
 )
-async def get_mcp_server_auth_header(toolset_id: UUID, session: DBSessionDep):
+async def get_mcp_server_auth_header(toolset_id: UUID, session: DBReadSessionDep):
     """Return the MCP server auth header for the specified toolset, if present."""
     repo = await get_toolset_repository(session, toolset_id)
     return repo.toolset.mcp_server_auth_header if repo.toolset else None
@@ -166,25 +299,18 @@ async def get_mcp_server_auth_header(toolset_id: UUID, session: DBSessionDep):
     response_model=ToolResponse,
     tags=["Tool Management"],
 )
-async def create_tool(toolset_id: UUID, data: CreateTool, session: DBSessionDep):
+async def create_tool(toolset_id: UUID, data: CreateTool, session: DBWriteSessionDep):
     """Create a new tool inside a custom toolset."""
-    toolset_repo = await get_toolset_repository(session, toolset_id)
-    toolset_schema = toolset_repo.get_toolset()
-    if toolset_schema.toolset_type != ToolsetTypeEnum.CUSTOM:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Tools can only be added to CUSTOM toolsets.")
-
-    tool_type = data.enum
-    if tool_type is None:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="tool_type is required.")
+    await _ensure_custom_toolset(session, toolset_id)
 
-    if tool_type == ToolTypeEnum.AGENT and data.target_agent_id:
+    if isinstance(data, CreateAgentTool):
         await _ensure_agent_exists(session, data.target_agent_id)
 
     tool_repo = await create_tool_repository(
         session=session,
         name=data.name,
         description=data.description,
-        tool_type=tool_type,
+        tool_type=data.enum,
         webhook_url=data.webhook_url,
         webhook_auth_header=data.webhook_auth_header,
         webhook_query_params_schema=data.webhook_query_params_schema,
@@ -197,7 +323,7 @@ async def create_tool(toolset_id: UUID, data: CreateTool, session: DBSessionDep)
         target_agent_id=data.target_agent_id,
         toolset_id=toolset_id,
     )
-    await session.commit()
+    _invalidate_toolset_on_commit(session, toolset_id)
     return tool_repo.get_tool()
 
 
@@ -206,10 +332,21 @@ async def create_tool(toolset_id: UUID, data: CreateTool, session: DBSessionDep)
     response_model=ToolResponse,
     tags=["Tool Management"],
 )
-async def get_tool(tool_id: UUID, session: DBSessionDep):
+async def get_tool(tool_id: UUID, request: Request, response: Response, session: DBReadSessionDep):
     """Retrieve a tool by its identifier."""
-    repo = await get_tool_repository(session, tool_id)
-    return repo.get_tool()
+    version = await ToolRepository.get_tool_version(session, tool_id)
+    if version is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tool not found")
+    etag = _etag(tool_id, *version)
+    not_modified = _not_modified(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    async def build() -> bytes:
+        repo = await get_tool_repository(session, tool_id)
+        return ToolResponse.from_orm_fast(repo.get_tool()).model_dump_json()
+
+    return await _cached_json_response(response, ("tool", *version, tool_id), build)
 
 
 @toolset_router.patch(
@@ -217,13 +354,13 @@ async def get_tool(tool_id: UUID, session: DBSessionDep):
     response_model=ToolResponse,
     tags=["Tool Management"],
 )
-async def update_tool(tool_id: UUID, data: UpdateTool, session: DBSessionDep):
+async def update_tool(tool_id: UUID, data: UpdateTool, session: DBWriteSessionDep):
     """Update tool metadata or configuration within a custom toolset."""
     tool_repo = await get_tool_repository(session, tool_id)
     if not tool_repo.tool or not tool_repo.tool.toolset_id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Tool is not linked to a toolset.")
 
-    toolset_repo = await get_toolset_repository(session, tool_repo.tool.toolset_id)
+    toolset_repo = ToolsetRepository.from_loaded(session, tool_repo.tool.toolset)
     if toolset_repo.get_toolset().toolset_type != ToolsetTypeEnum.CUSTOM:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Tools can only be updated for CUSTOM toolsets.")
 
@@ -246,7 +383,7 @@ async def update_tool(tool_id: UUID, data: UpdateTool, session: DBSessionDep):
         output_schema=data.output_schema,
         target_agent_id=data.target_agent_id,
     )
-    await session.commit()
+    _invalidate_toolset_on_commit(session, tool_repo.tool.toolset_id, (tool_id,))
     return tool_repo.get_tool()
 
 
@@ -255,18 +392,19 @@ async def update_tool(tool_id: UUID, data: UpdateTool, session: DBSessionDep):
     status_code=status.HTTP_204_NO_CONTENT,
     tags=["Tool Management"],
 )
-async def delete_tool(tool_id: UUID, session: DBSessionDep):
+async def delete_tool(tool_id: UUID, session: DBWriteSessionDep):
     """Delete a tool from its toolset."""
     repo = await get_tool_repository(session, tool_id)
     await repo.delete()
-    await session.commit()
+    if repo.tool.toolset_id:
+        _invalidate_toolset_on_commit(session, repo.tool.toolset_id, (tool_id,))
 
 
 @toolset_router.get(
     "/tools/{tool_id}/webhook-auth-header",
     tags=["Tool Management"],
 )
-async def get_webhook_auth_header(tool_id: UUID, session: DBSessionDep):
+async def get_webhook_auth_header(tool_id: UUID, session: DBReadSessionDep):
     """Return the webhook authorization headers for the specified tool, if set."""
     repo = await get_tool_repository(session, tool_id)
     return repo.tool.webhook_auth_header if repo.tool else None
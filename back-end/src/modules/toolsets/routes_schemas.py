@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Annotated, Dict, List, Literal, Optional, Union
 from uuid import UUID
 
 from pydantic import (
@@ -15,36 +15,71 @@ from pydantic import (
 )
 from pydantic_core import ErrorDetails
 
-from src.modules.toolsets.enums.enums import ToolTypeEnum, ToolsetTypeEnum
+from src.modules.toolsets.enums.enums import (
+    TOOL_TYPE_BY_NAME,
+    TOOLSET_TYPE_BY_NAME,
+    VISIBLE_TOOL_TYPE_NAMES,
+    VISIBLE_TOOLSET_TYPE_NAMES,
+    ToolTypeEnum,
+    ToolsetTypeEnum,
+)
+
+
+# Visible names never change, so the allowed sets and the error messages are
+# built once at import instead of on every validated request body.
+_ALLOWED_TOOL_TYPES = frozenset(VISIBLE_TOOL_TYPE_NAMES)
+_ALLOWED_TOOL_TYPES_STR = ", ".join(VISIBLE_TOOL_TYPE_NAMES)
+_ALLOWED_TOOLSET_TYPES = frozenset(VISIBLE_TOOLSET_TYPE_NAMES)
+_ALLOWED_TOOLSET_TYPES_STR = ", ".join(VISIBLE_TOOLSET_TYPE_NAMES)
+# Static parts of the cross-field errors; _error_details only adds the input
+# when an error is actually raised.
+_ERR_WEBHOOK_URL_MISSING = {
+    "type": "missing",
+    "loc": ("webhook_url",),
+    "msg": "webhook_url is required for WEBHOOK tools.",
+}
+_ERR_TARGET_AGENT_ID_MISSING = {
+    "type": "missing",
+    "loc": ("target_agent_id",),
+    "msg": "target_agent_id is required for AGENT tools.",
+}
+_ERR_MCP_SERVER_URL_MISSING = {
+    "type": "missing",
+    "loc": ("mcp_server_url",),
+    "msg": "mcp_server_url is required for MCP_SERVER toolsets.",
+}
+_ERR_MCP_TOOLS_NOT_ALLOWED = {
+    "type": "value_error",
+    "loc": ("tools",),
+    "msg": "Tools cannot be provided for MCP_SERVER toolsets.",
+}
+
+
+def _error_details(template: dict, value) -> ErrorDetails:
+    return {**template, "input": value}
+
+
+# A closed set, so it is validated as a Literal instead of a regex pattern.
+WebhookHttpMethod = Literal["GET", "POST", "PUT", "PATCH", "DELETE"]
+
+# Rendered into the Field descriptions below.
+_TOOL_TYPE_NAMES = ToolTypeEnum.get_field_names()
+_TOOLSET_TYPE_NAMES = ToolsetTypeEnum.get_field_names()
 
 
 def _validate_tool_type(value: Optional[str]) -> Optional[str]:
-    if value is None:
+    if value is None or value in _ALLOWED_TOOL_TYPES:
         return value
-    allowed = [enum.name for enum in ToolTypeEnum.get_visible_types()]
-    if value not in allowed:
-        allowed_str = ", ".join(allowed)
-        raise ValueError(f"tool_type must be one of: {allowed_str}")
-    return value
+    raise ValueError(f"tool_type must be one of: {_ALLOWED_TOOL_TYPES_STR}")
 
 
 def _validate_toolset_type(value: Optional[str]) -> Optional[str]:
-    if value is None:
+    if value is None or value in _ALLOWED_TOOLSET_TYPES:
         return value
-    allowed = [enum.name for enum in ToolsetTypeEnum.get_visible_types()]
-    if value not in allowed:
-        allowed_str = ", ".join(allowed)
-        raise ValueError(f"toolset_type must be one of: {allowed_str}")
-    return value
+    raise ValueError(f"toolset_type must be one of: {_ALLOWED_TOOLSET_TYPES_STR}")
 
 
-class CreateTool(BaseModel):
-    _tool_type_enum: Optional[ToolTypeEnum] = PrivateAttr(default=None)
-
-    tool_type: Optional[str] = Field(
-        default=None,
-        description=f"Type of tool to create. Allowed values: {ToolTypeEnum.get_field_names()}.",
-    )
+class _CreateToolBase(BaseModel):
     name: str = Field(
         ...,
         min_length=1,
@@ -76,10 +111,9 @@ class CreateTool(BaseModel):
         default=None,
         description="JSON schema describing accepted body parameters for webhook tools.",
     )
-    webhook_http_method: Optional[str] = Field(
+    webhook_http_method: Optional[WebhookHttpMethod] = Field(
         default=None,
         description="HTTP method to use for webhook tools.",
-        pattern="^(GET|POST|PUT|PATCH|DELETE)$",
     )
     target_agent_id: Optional[UUID] = Field(
         default=None,
@@ -98,45 +132,31 @@ class CreateTool(BaseModel):
         description="JSON schema describing the tool output.",
     )
 
-    @field_validator("tool_type")
-    @classmethod
-    def validate_tool_type(cls, value: Optional[str]) -> Optional[str]:
-        return _validate_tool_type(value)
+    @property
+    def enum(self) -> ToolTypeEnum:
+        return TOOL_TYPE_BY_NAME[self.tool_type]
 
-    @model_validator(mode="after")
-    def validate_by_type(self):
-        if self.tool_type is not None:
-            self._tool_type_enum = ToolTypeEnum[self.tool_type]
 
-        if self._tool_type_enum == ToolTypeEnum.WEBHOOK and not self.webhook_url:
-            raise ValidationError.from_exception_data(
-                "CreateTool",
-                [
-                    ErrorDetails(
-                        type="missing",
-                        loc=("webhook_url",),
-                        msg="webhook_url is required for WEBHOOK tools.",
-                        input=self.webhook_url,
-                    )
-                ],
-            )
-        if self._tool_type_enum == ToolTypeEnum.AGENT and not self.target_agent_id:
-            raise ValidationError.from_exception_data(
-                "CreateTool",
-                [
-                    ErrorDetails(
-                        type="missing",
-                        loc=("target_agent_id",),
-                        msg="target_agent_id is required for AGENT tools.",
-                        input=self.target_agent_id,
-                    )
-                ],
-            )
-        return self
+class CreateWebhookTool(_CreateToolBase):
+    tool_type: Literal["WEBHOOK"] = Field(..., description="Type of tool to create.")
+    webhook_url: str = Field(
+        ...,
+        min_length=1,
+        description="Target URL invoked by the webhook tool.",
+    )
 
-    @property
-    def enum(self) -> Optional[ToolTypeEnum]:
-        return self._tool_type_enum
+
+class CreateAgentTool(_CreateToolBase):
+    tool_type: Literal["AGENT"] = Field(..., description="Type of tool to create.")
+    target_agent_id: UUID = Field(..., description="Identifier of the agent the tool calls.")
+
+
+# The tool_type tag selects the model inside pydantic-core, and each model
+# declares the fields its type requires, so no Python validator runs.
+CreateTool = Annotated[
+    Union[CreateWebhookTool, CreateAgentTool],
+    Field(discriminator="tool_type", description=f"Tool to create. Allowed tool_type values: {_TOOL_TYPE_NAMES}."),
+]
 
 
 class UpdateTool(BaseModel):
@@ -144,7 +164,7 @@ class UpdateTool(BaseModel):
 
     tool_type: Optional[str] = Field(
         default=None,
-        description=f"Updated tool type. Allowed values: {ToolTypeEnum.get_field_names()}.",
+        description=f"Updated tool type. Allowed values: {_TOOL_TYPE_NAMES}.",
     )
     name: Optional[str] = Field(
         default=None,
@@ -177,10 +197,9 @@ class UpdateTool(BaseModel):
         default=None,
         description="Updated JSON schema describing accepted body parameters for webhook tools.",
     )
-    webhook_http_method: Optional[str] = Field(
+    webhook_http_method: Optional[WebhookHttpMethod] = Field(
         default=None,
         description="Updated HTTP method to use for webhook tools.",
-        pattern="^(GET|POST|PUT|PATCH|DELETE)$",
     )
     target_agent_id: Optional[UUID] = Field(
         default=None,
@@ -207,31 +226,15 @@ class UpdateTool(BaseModel):
     @model_validator(mode="after")
     def validate_by_type(self):
         if self.tool_type is not None:
-            self._tool_type_enum = ToolTypeEnum[self.tool_type]
+            self._tool_type_enum = TOOL_TYPE_BY_NAME[self.tool_type]
 
         if self._tool_type_enum == ToolTypeEnum.WEBHOOK and self.webhook_url is None:
             raise ValidationError.from_exception_data(
-                "UpdateTool",
-                [
-                    ErrorDetails(
-                        type="missing",
-                        loc=("webhook_url",),
-                        msg="webhook_url is required for WEBHOOK tools.",
-                        input=self.webhook_url,
-                    )
-                ],
+                "UpdateTool", [_error_details(_ERR_WEBHOOK_URL_MISSING, self.webhook_url)]
             )
         if self._tool_type_enum == ToolTypeEnum.AGENT and self.target_agent_id is None:
             raise ValidationError.from_exception_data(
-                "UpdateTool",
-                [
-                    ErrorDetails(
-                        type="missing",
-                        loc=("target_agent_id",),
-                        msg="target_agent_id is required for AGENT tools.",
-                        input=self.target_agent_id,
-                    )
-                ],
+                "UpdateTool", [_error_details(_ERR_TARGET_AGENT_ID_MISSING, self.target_agent_id)]
             )
         return self
 
@@ -241,7 +244,7 @@ class UpdateTool(BaseModel):
 
 
 class ToolResponse(BaseModel):
-    model_config = ConfigDict(extra="ignore")
+    model_config = ConfigDict(extra="ignore", frozen=True)
 
     id: UUID = Field(..., description="Unique identifier of the tool.")
     name: str = Field(..., min_length=1, max_length=255, description="Display name of the tool.")
@@ -299,13 +302,25 @@ class ToolResponse(BaseModel):
     created_at: datetime = Field(..., description="Timestamp when the tool was created.")
     updated_at: datetime = Field(..., description="Timestamp when the tool was last updated.")
 
+    @classmethod
+    def from_orm_fast(cls, tool) -> "ToolResponse":
+        """
+        Build the response from a ToolSchema without validation.
+
+        Only for schemas built from ORM rows: their values are already typed,
+        so the only conversion needed is the enum to its name.
+        """
+        data = {field: getattr(tool, field) for field in _TOOL_RESPONSE_FIELDS}
+        data["tool_type"] = str(tool.tool_type)
+        return cls.model_construct(**data)
+
 
 class CreateToolset(BaseModel):
     _toolset_type_enum: Optional[ToolsetTypeEnum] = PrivateAttr(default=None)
 
     toolset_type: Optional[str] = Field(
         default=None,
-        description=f"Type of the toolset. Allowed values: {ToolsetTypeEnum.get_field_names()}.",
+        description=f"Type of the toolset. Allowed values: {_TOOLSET_TYPE_NAMES}.",
     )
     name: str = Field(
         ...,
@@ -339,33 +354,16 @@ class CreateToolset(BaseModel):
     @model_validator(mode="after")
     def validate_schema(self):
         if self.toolset_type is not None:
-            self._toolset_type_enum = ToolsetTypeEnum[self.toolset_type]
+            self._toolset_type_enum = TOOLSET_TYPE_BY_NAME[self.toolset_type]
 
-        if self._toolset_type_enum == ToolsetTypeEnum.MCP_SERVER:
+        if self._toolset_type_enum == ToolsetTypeEnum.MCP_SERVER and (not self.mcp_server_url or self.tools):
+            # Both problems can occur together, so report them in one error.
+            errors = []
             if not self.mcp_server_url:
-                raise ValidationError.from_exception_data(
-                    "CreateToolset",
-                    [
-                        ErrorDetails(
-                            type="missing",
-                            loc=("mcp_server_url",),
-                            msg="mcp_server_url is required for MCP_SERVER toolsets.",
-                            input=self.mcp_server_url,
-                        )
-                    ],
-                )
+                errors.append(_error_details(_ERR_MCP_SERVER_URL_MISSING, self.mcp_server_url))
             if self.tools:
-                raise ValidationError.from_exception_data(
-                    "CreateToolset",
-                    [
-                        ErrorDetails(
-                            type="value_error",
-                            loc=("tools",),
-                            msg="Tools cannot be provided for MCP_SERVER toolsets.",
-                            input=[tool.name for tool in self.tools],
-                        )
-                    ],
-                )
+                errors.append(_error_details(_ERR_MCP_TOOLS_NOT_ALLOWED, [tool.name for tool in self.tools]))
+            raise ValidationError.from_exception_data("CreateToolset", errors)
         return self
 
     @property
@@ -378,7 +376,7 @@ class UpdateToolset(BaseModel):
 
     toolset_type: Optional[str] = Field(
         default=None,
-        description=f"Updated toolset type. Allowed values: {ToolsetTypeEnum.get_field_names()}.",
+        description=f"Updated toolset type. Allowed values: {_TOOLSET_TYPE_NAMES}.",
     )
     name: Optional[str] = Field(
         default=None,
@@ -408,19 +406,11 @@ class UpdateToolset(BaseModel):
     @model_validator(mode="after")
     def validate_schema(self):
         if self.toolset_type is not None:
-            self._toolset_type_enum = ToolsetTypeEnum[self.toolset_type]
+            self._toolset_type_enum = TOOLSET_TYPE_BY_NAME[self.toolset_type]
 
         if self._toolset_type_enum == ToolsetTypeEnum.MCP_SERVER and not self.mcp_server_url:
             raise ValidationError.from_exception_data(
-                "UpdateToolset",
-                [
-                    ErrorDetails(
-                        type="missing",
-                        loc=("mcp_server_url",),
-                        msg="mcp_server_url is required for MCP_SERVER toolsets.",
-                        input=self.mcp_server_url,
-                    )
-                ],
+                "UpdateToolset", [_error_details(_ERR_MCP_SERVER_URL_MISSING, self.mcp_server_url)]
             )
         return self
 
@@ -430,7 +420,7 @@ class UpdateToolset(BaseModel):
 
 
 class ToolsetResponse(BaseModel):
-    model_config = ConfigDict(extra="ignore")
+    model_config = ConfigDict(extra="ignore", frozen=True)
 
     id: UUID = Field(..., description="Unique identifier of the toolset.")
     name: str = Field(..., min_length=1, max_length=255, description="Display name of the toolset.")
@@ -460,10 +450,32 @@ class ToolsetResponse(BaseModel):
         description="Tools contained within this toolset.",
     )
 
+    @classmethod
+    def from_orm_fast(cls, toolset) -> "ToolsetResponse":
+        """
+        Build the response from a ToolsetSchema without validation.
+
+        Only for schemas built from ORM rows, as in ToolResponse.from_orm_fast.
+        """
+        data = {field: getattr(toolset, field) for field in _TOOLSET_RESPONSE_FIELDS}
+        data["toolset_type"] = str(toolset.toolset_type)
+        data["tools"] = [ToolResponse.from_orm_fast(tool) for tool in toolset.tools]
+        return cls.model_construct(**data)
+
 
 class ToolsetListResponse(BaseModel):
-    total_toolsets: int = Field(..., ge=0, description="Total number of toolsets available.")
+    model_config = ConfigDict(frozen=True)
+
+    total_toolsets: int = Field(..., description="Total number of toolsets available.")
     toolsets: List[ToolsetResponse] = Field(
         default_factory=list,
         description="Paginated list of toolsets.",
     )
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor for the next page of toolsets; absent on the last page.",
+    )
+
+
+_TOOL_RESPONSE_FIELDS = tuple(ToolResponse.model_fields)
+_TOOLSET_RESPONSE_FIELDS = tuple(field for field in ToolsetResponse.model_fields if field != "tools")
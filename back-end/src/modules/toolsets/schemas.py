@@ -9,6 +9,11 @@ from pydantic import BaseModel, ConfigDict, Field, field_serializer
 
 
 class ToolSchema(BaseModel):
+    # Instances are mostly built with model_construct from ORM rows, so the
+    # validator/serializer are only compiled on first real use, not at import.
+    # They are read-only snapshots of those rows, hence frozen.
+    model_config = ConfigDict(defer_build=True, frozen=True)
+
     id: UUID
     tool_type: ToolTypeEnum
     name: str
@@ -36,6 +41,8 @@ class ToolSchema(BaseModel):
 
 
 class ToolsetSchema(BaseModel):
+    model_config = ConfigDict(defer_build=True, frozen=True)
+
     id: UUID
     toolset_type: ToolsetTypeEnum
     enum_toolset_type: str
@@ -52,7 +59,4 @@ class ToolsetSchema(BaseModel):
     @field_serializer("toolset_type")
     def serialize_toolset_type(self, value: ToolsetTypeEnum) -> str:
         return str(value.name)
-
-ToolSchema.model_rebuild()
-ToolsetSchema.model_rebuild()
  
\ No newline at end of file
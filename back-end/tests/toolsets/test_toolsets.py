@@ -1,99 +1,207 @@
 import pytest
+from uuid import UUID, uuid4
 from httpx import AsyncClient
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, patch
 
-@pytest.fixture
-async def toolset_id(client: AsyncClient):
-    response = await client.post("/toolsets", json={"name": "Test TS", "description": "Desc", "toolset_type": "CUSTOM"})
-    assert response.status_code == 201
-    return response.json()["id"]
+from src.modules.toolsets.routes import _response_body_cache
+
+CUSTOM_TOOLSET_PAYLOAD = {"name": "Test TS", "description": "Desc", "toolset_type": "CUSTOM"}
+WEBHOOK_TOOL_PAYLOAD = {
+    "name": "Test Tool",
+    "description": "Tool Desc",
+    "tool_type": "WEBHOOK",
+    "webhook_url": "http://example.com",
+    "webhook_http_method": "GET"
+}
+
+@pytest.fixture(scope="module")
+def mcp_manager_mock():
+    mock_manager = AsyncMock()
+    # Awaiting an AsyncMock child returns a MagicMock, which the route would
+    # treat as the list of created tools, so pin it to None explicitly.
+    mock_manager.setup_mcp.return_value = None
+    with patch("src.modules.toolsets.routes.MCPManager", return_value=mock_manager):
+        yield mock_manager
+
+@pytest.fixture(autouse=True)
+def _clear_response_body_cache():
+    # Each test is rolled back, so revisions repeat across tests and a body
+    # cached by an earlier test could otherwise match the same ETag.
+    _response_body_cache.clear()
 
 @pytest.fixture
-async def tool_id(client: AsyncClient, toolset_id):
-    tool_payload = {
-        "name": "Test Tool",
-        "description": "Tool Desc",
-        "tool_type": "WEBHOOK",
-        "webhook_url": "http://example.com",
-        "webhook_http_method": "GET"
-    }
-    response = await client.post(f"/toolsets/{toolset_id}/tools", json=tool_payload)
+async def toolset_id(client: AsyncClient):
+    response = await client.post("/toolsets", json=CUSTOM_TOOLSET_PAYLOAD)
     assert response.status_code == 201
     return response.json()["id"]
 
-@pytest.mark.asyncio
 async def test_create_toolset(client: AsyncClient):
     response = await client.post("/toolsets", json={"name": "Custom TS", "description": "Desc", "toolset_type": "CUSTOM"})
     assert response.status_code == 201
     assert response.json()["name"] == "Custom TS"
 
-@pytest.mark.asyncio
-async def test_get_toolset(client: AsyncClient, toolset_id):
+async def test_create_toolset_with_nested_tools(client: AsyncClient):
+    names = ["First", "Second", "Third"]
+    payload = {
+        **CUSTOM_TOOLSET_PAYLOAD,
+        "tools": [{**WEBHOOK_TOOL_PAYLOAD, "name": name} for name in names],
+    }
+    response = await client.post("/toolsets", json=payload)
+    assert response.status_code == 201
+    data = response.json()
+    assert [tool["name"] for tool in data["tools"]] == names
+
+    response = await client.get(f"/toolsets/{data['id']}")
+    assert sorted(tool["name"] for tool in response.json()["tools"]) == sorted(names)
+
+async def test_create_toolset_with_unknown_target_agent(client: AsyncClient):
+    agent_tool = {"name": "Agent Tool", "tool_type": "AGENT", "target_agent_id": str(uuid4())}
+    response = await client.post("/toolsets", json={**CUSTOM_TOOLSET_PAYLOAD, "tools": [agent_tool]})
+    assert response.status_code == 404
+
+async def test_get_toolset_etag(client: AsyncClient, toolset_id):
+    response = await client.get(f"/toolsets/{toolset_id}")
+    etag = response.headers["etag"]
+
+    response = await client.get(f"/toolsets/{toolset_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    response = await client.get(f"/toolsets/{toolset_id}", headers={"If-None-Match": 'W/"stale"'})
+    assert response.status_code == 200
+
+async def test_toolset_write_drops_cached_bodies(client: AsyncClient, toolset_id):
+    await client.get(f"/toolsets/{toolset_id}")
+    await client.get("/toolsets")
+    assert len(_response_body_cache) == 2
+
+    response = await client.patch(f"/toolsets/{toolset_id}", json={"name": "Renamed"})
+    assert response.status_code == 200
+    assert len(_response_body_cache) == 0
+
+async def test_tool_update_changes_toolset_etag(client: AsyncClient, toolset_id):
+    response = await client.post(f"/toolsets/{toolset_id}/tools", json=WEBHOOK_TOOL_PAYLOAD)
+    tool_id = response.json()["id"]
+    response = await client.get(f"/toolsets/{toolset_id}")
+    etag, updated_at = response.headers["etag"], response.json()["updated_at"]
+
+    response = await client.patch(f"/tools/{tool_id}", json={"name": "Renamed Tool"})
+    assert response.status_code == 200
+
+    response = await client.get(f"/toolsets/{toolset_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["tools"][0]["name"] == "Renamed Tool"
+    # Only the revision moves; the toolset row itself was not edited.
+    assert response.json()["updated_at"] == updated_at
+
+async def test_list_toolsets_etag_changes_on_tool_write(client: AsyncClient, toolset_id):
+    response = await client.get("/toolsets")
+    etag = response.headers["etag"]
+
+    response = await client.post(f"/toolsets/{toolset_id}/tools", json=WEBHOOK_TOOL_PAYLOAD)
+    assert response.status_code == 201
+
+    response = await client.get("/toolsets", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert len(response.json()["toolsets"][0]["tools"]) == 1
+
+async def test_list_toolsets_cursor(client: AsyncClient):
+    for name in ("TS 1", "TS 2", "TS 3"):
+        response = await client.post("/toolsets", json={"name": name, "toolset_type": "CUSTOM"})
+        assert response.status_code == 201
+
+    response = await client.get("/toolsets", params={"page_size": 2})
+    assert response.status_code == 200
+    first_page = response.json()
+    assert len(first_page["toolsets"]) == 2
+    assert first_page["next_cursor"]
+
+    response = await client.get("/toolsets", params={"page_size": 2, "cursor": first_page["next_cursor"]})
+    assert response.status_code == 200
+    second_page = response.json()
+    assert len(second_page["toolsets"]) == 1
+    assert second_page["next_cursor"] is None
+    ids = {ts["id"] for ts in first_page["toolsets"] + second_page["toolsets"]}
+    assert len(ids) == 3
+
+    response = await client.get("/toolsets", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+async def test_create_tool(client: AsyncClient, toolset_id):
+    response = await client.post(f"/toolsets/{toolset_id}/tools", json={**WEBHOOK_TOOL_PAYLOAD, "name": "My Tool"})
+    assert response.status_code == 201
+    assert response.json()["name"] == "My Tool"
+
+@pytest.mark.parametrize("payload", [
+    {key: value for key, value in WEBHOOK_TOOL_PAYLOAD.items() if key != "tool_type"},
+    {**WEBHOOK_TOOL_PAYLOAD, "tool_type": "UNKNOWN"},
+    {key: value for key, value in WEBHOOK_TOOL_PAYLOAD.items() if key != "webhook_url"},
+], ids=["missing_tool_type", "unknown_tool_type", "webhook_without_url"])
+async def test_create_tool_invalid_payload(client: AsyncClient, toolset_id, payload):
+    response = await client.post(f"/toolsets/{toolset_id}/tools", json=payload)
+    assert response.status_code == 422
+
+async def test_create_tool_in_non_custom_toolset(client: AsyncClient, mcp_manager_mock):
+    payload = {"name": "MCP Server", "toolset_type": "MCP_SERVER", "mcp_server_url": "http://mcp.local"}
+    response = await client.post("/toolsets", json=payload)
+    mcp_toolset_id = response.json()["id"]
+
+    response = await client.post(f"/toolsets/{mcp_toolset_id}/tools", json=WEBHOOK_TOOL_PAYLOAD)
+    assert response.status_code == 400
+
+async def test_tool_writes_invalidate_built_toolsets(client: AsyncClient, toolset_id):
+    response = await client.post(f"/toolsets/{toolset_id}/tools", json=WEBHOOK_TOOL_PAYLOAD)
+    tool_id = response.json()["id"]
+
+    with patch("src.modules.toolsets.routes.invalidate_toolset") as mock_invalidate:
+        response = await client.delete(f"/tools/{tool_id}")
+    assert response.status_code == 204
+    mock_invalidate.assert_called_once_with(UUID(toolset_id), (UUID(tool_id),))
+
+async def test_delete_is_persistent(client: AsyncClient, toolset_id):
+    response = await client.delete(f"/toolsets/{toolset_id}")
+    assert response.status_code == 204
+
+    response = await client.get(f"/toolsets/{toolset_id}")
+    assert response.status_code == 404
+
+async def test_toolset_lifecycle(client: AsyncClient):
+    response = await client.post("/toolsets", json=CUSTOM_TOOLSET_PAYLOAD)
+    assert response.status_code == 201
+    toolset_id = response.json()["id"]
+
     response = await client.get(f"/toolsets/{toolset_id}")
     assert response.status_code == 200
     assert response.json()["name"] == "Test TS"
 
-@pytest.mark.asyncio
-async def test_update_toolset(client: AsyncClient, toolset_id):
     response = await client.patch(f"/toolsets/{toolset_id}", json={"name": "Updated TS"})
     assert response.status_code == 200
     assert response.json()["name"] == "Updated TS"
 
-@pytest.mark.asyncio
-async def test_list_toolsets(client: AsyncClient, toolset_id):
     response = await client.get("/toolsets")
     assert response.status_code == 200
     assert len(response.json()["toolsets"]) > 0
 
-@pytest.mark.asyncio
-async def test_delete_toolset(client: AsyncClient, toolset_id):
     response = await client.delete(f"/toolsets/{toolset_id}")
     assert response.status_code == 204
-    
-    response = await client.get(f"/toolsets/{toolset_id}")
-    assert response.status_code == 404
 
-@pytest.mark.asyncio
-async def test_create_tool(client: AsyncClient, toolset_id):
-    tool_payload = {
-        "name": "My Tool",
-        "description": "Tool Desc",
-        "tool_type": "WEBHOOK",
-        "webhook_url": "http://example.com",
-        "webhook_http_method": "GET"
-    }
-    response = await client.post(f"/toolsets/{toolset_id}/tools", json=tool_payload)
+async def test_tool_lifecycle(client: AsyncClient, toolset_id):
+    response = await client.post(f"/toolsets/{toolset_id}/tools", json=WEBHOOK_TOOL_PAYLOAD)
     assert response.status_code == 201
-    assert response.json()["name"] == "My Tool"
+    tool_id = response.json()["id"]
 
-@pytest.mark.asyncio
-async def test_get_tool(client: AsyncClient, tool_id):
     response = await client.get(f"/tools/{tool_id}")
     assert response.status_code == 200
     assert response.json()["name"] == "Test Tool"
 
-@pytest.mark.asyncio
-async def test_update_tool(client: AsyncClient, tool_id):
     response = await client.patch(f"/tools/{tool_id}", json={"name": "Updated Tool"})
     assert response.status_code == 200
     assert response.json()["name"] == "Updated Tool"
 
-@pytest.mark.asyncio
-async def test_delete_tool(client: AsyncClient, tool_id):
     response = await client.delete(f"/tools/{tool_id}")
     assert response.status_code == 204
-    
-    response = await client.get(f"/tools/{tool_id}")
-    assert response.status_code == 404
 
-@pytest.mark.asyncio
-async def test_mcp_toolset(client: AsyncClient, mocker):
-    # Mock MCPManager
-    mock_manager = AsyncMock()
-    mock_manager.setup_mcp.return_value = None
-    
-    mocker.patch("src.modules.toolsets.routes.MCPManager", return_value=mock_manager)
-    
+async def test_mcp_toolset(client: AsyncClient, mcp_manager_mock):
     payload = {
         "name": "MCP Server",
         "toolset_type": "MCP_SERVER",